@@ -0,0 +1,128 @@
+"""Synthetic MoAI project generator for the tooling benchmarks.
+
+Builds a repo with N SPECs and a matching tree: one spec.md (front matter,
+HISTORY, EARS body), one @CODE source file, one @TEST file and one @DOC page per
+SPEC, plus a sprinkling of untagged files. Output is deterministic for a given
+N and seed.
+
+Usage:
+    python3 .moai/scripts/bench_synth.py /tmp/moai-bench-1k --specs 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+
+DOMAINS = (
+    "PRODUCT", "ORDER", "PAYMENT", "INVENTORY", "USER", "CART", "SHIPPING", "COUPON", "REVIEW", "SEARCH",
+    "AUTH", "SELLER", "ADMIN", "NOTIFY", "REFUND", "POINT", "CATEGORY", "SETTLE", "STATS", "BANNER",
+)
+SPEC_TEMPLATE = """---
+id: {id}
+version: {version}
+status: {status}
+created: 2025-09-{day:02d}
+updated: 2025-10-{day:02d}
+author: @suzhanlee
+priority: {priority}
+category: feature
+labels:
+  - {domain_lower}
+{relations}scope:
+  packages:
+    - src/main/java/com/shop/{domain_lower}
+  files:
+    - {cls}.java
+---
+
+# @SPEC:{id}: {domain} capability {num}
+
+## HISTORY
+
+{history}
+---
+
+## Requirements
+
+### Ubiquitous Requirements
+- The system shall provide {domain_lower} capability {num}.
+
+### Event-driven Requirements
+- WHEN a {domain_lower} request arrives, the system shall validate it.
+"""
+
+
+def spec_ids(count: int) -> list[str]:
+    per_domain = -(-count // len(DOMAINS))
+    if per_domain > 999:
+        raise ValueError(f"at most {999 * len(DOMAINS)} SPECs are supported")
+    return [f"{DOMAINS[i % len(DOMAINS)]}-{i // len(DOMAINS) + 1:03d}" for i in range(count)]
+
+
+def _history(rng: random.Random, versions: int) -> tuple[str, str]:
+    entries = []
+    major, minor, patch = 0, 0, 1
+    for step in range(versions):
+        if step:
+            kind = rng.choice(("ADDED", "CHANGED", "FIXED", "BREAKING"))
+            minor, patch = (minor + 1, 0) if kind in ("ADDED", "BREAKING") else (minor, patch + 1)
+        else:
+            kind = "INITIAL"
+        entries.append(
+            f"### v{major}.{minor}.{patch} (2025-10-{step + 1:02d})\n"
+            f"- **{kind}**: change {step}\n- **AUTHOR**: @suzhanlee\n- **REVIEW**: @reviewer (approved)\n"
+        )
+    return "\n".join(reversed(entries)), f"{major}.{minor}.{patch}"
+
+
+def generate(target: Path, count: int, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    ids = spec_ids(count)
+    (target / ".moai").mkdir(parents=True, exist_ok=True)
+    (target / ".moai" / "config.json").write_text(json.dumps({"language": "java"}), encoding="utf-8")
+    (target / "build.gradle").write_text("plugins { id 'java' }\n", encoding="utf-8")
+    for n, spec_id in enumerate(ids):
+        domain, num = spec_id.rsplit("-", 1)
+        cls = f"{domain.title()}{num}Service"
+        deps = rng.sample(ids[max(0, n - 50):n], k=min(n, rng.randint(0, 2)))
+        relations = "depends_on:\n" + "".join(f"  - {d}\n" for d in deps) if deps else ""
+        history, version = _history(rng, rng.randint(1, 4))
+        spec_dir = target / ".moai" / "specs" / f"SPEC-{spec_id}"
+        spec_dir.mkdir(parents=True, exist_ok=True)
+        (spec_dir / "spec.md").write_text(SPEC_TEMPLATE.format(
+            id=spec_id, version=version, status=rng.choice(("draft", "active", "completed")),
+            day=n % 28 + 1, priority=rng.choice(("low", "medium", "high", "critical")),
+            domain=domain, domain_lower=domain.lower(), num=num, cls=cls, relations=relations, history=history,
+        ), encoding="utf-8")
+        _write(target / "src/main/java/com/shop" / domain.lower() / f"{cls}.java",
+               f"// @CODE:{spec_id} | SPEC: SPEC-{spec_id}.md v{version}\npackage com.shop.{domain.lower()};\n\n"
+               f"public class {cls} {{\n    public int run() {{ return {n}; }}\n}}\n")
+        _write(target / "src/test/java/com/shop" / domain.lower() / f"{cls}Test.java",
+               f"// @TEST:{spec_id} | SPEC: SPEC-{spec_id}.md\npackage com.shop.{domain.lower()};\n\n"
+               f"class {cls}Test {{\n}}\n")
+        _write(target / "docs" / domain.lower() / f"{spec_id}.md", f"# @DOC:{spec_id} {cls}\n\nUsage notes.\n")
+        if n % 10 == 0:
+            _write(target / "src/main/java/com/shop/util" / f"Helper{n}.java", "class Helper {}\n")
+
+
+def _write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("target", type=Path)
+    parser.add_argument("--specs", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+    generate(args.target, args.specs, args.seed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
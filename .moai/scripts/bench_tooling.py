@@ -0,0 +1,180 @@
+"""Benchmarks and regression gate for the MoAI tooling hot paths.
+
+Generates synthetic projects (see bench_synth.py), runs every stage in a fresh
+subprocess and records wall time, peak RSS and files per second. Results can
+be saved as a JSON baseline and compared against one; any stage slower or
+bigger than the baseline by more than `--threshold` fails the run.
+
+Usage:
+    python3 .moai/scripts/bench_tooling.py --sizes 100,1000 --save-baseline .moai/bench/baseline.json
+    python3 .moai/scripts/bench_tooling.py --sizes 100,1000 --baseline .moai/bench/baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from bench_synth import generate
+from moai_core import SPEC_GLOB, detect_language, load_spec_header
+
+SCRIPT = Path(__file__).resolve()
+MIN_WALL_DELTA_S = 0.05
+MIN_RSS_DELTA_MB = 5.0
+
+
+def _stage_tag_scan_cold(repo: Path) -> int:
+    from tag_index import TagIndex
+
+    db = repo / ".moai" / "cache" / "tag-index.sqlite3"
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{db}{suffix}").unlink(missing_ok=True)
+    with TagIndex(repo) as index:
+        return index.refresh().scanned
+
+
+def _stage_tag_scan_warm(repo: Path) -> int:
+    from tag_index import TagIndex
+
+    with TagIndex(repo) as index:
+        return index.refresh().scanned
+
+
+def _stage_spec_validate(repo: Path) -> int:
+    from spec_validator import validate_all
+
+    return sum(1 for _ in validate_all(sorted(repo.glob(SPEC_GLOB)), repo))
+
+
+def _stage_history(repo: Path) -> int:
+    paths = sorted(repo.glob(SPEC_GLOB))
+    for path in paths:
+        load_spec_header(path)
+    return len(paths)
+
+
+def _stage_history_store(repo: Path) -> int:
+    from history_store import HistoryStore
+
+    (repo / ".moai" / "cache" / "history.bin").unlink(missing_ok=True)
+    store = HistoryStore(repo)
+    parsed, _ = store.refresh()
+    HistoryStore(repo).changes(types=["BREAKING"])
+    return parsed
+
+
+def _stage_language_detect(repo: Path) -> int:
+    for _ in range(1000):
+        detect_language(repo)
+    return 1000
+
+
+STAGES: dict[str, Callable[[Path], int]] = {
+    "tag_scan_cold": _stage_tag_scan_cold,
+    "tag_scan_warm": _stage_tag_scan_warm,
+    "spec_validate": _stage_spec_validate,
+    "history": _stage_history,
+    "history_store": _stage_history_store,
+    "language_detect": _stage_language_detect,
+}
+
+
+def _peak_rss_mb() -> float:
+    """Peak RSS of this process and its reaped children (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    peak = max(resource.getrusage(who).ru_maxrss for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN))
+    return round(peak / scale, 1)
+
+
+def run_stage_inline(stage: str, repo: Path) -> dict[str, Any]:
+    started = time.perf_counter()
+    files = STAGES[stage](repo)
+    wall = time.perf_counter() - started
+    return {"wall_s": round(wall, 4), "peak_rss_mb": _peak_rss_mb(), "files": files,
+            "files_per_s": round(files / wall, 1) if wall else None}
+
+
+def run_stage(stage: str, repo: Path) -> dict[str, Any]:
+    """Run one stage in a fresh interpreter so peak RSS is not shared between stages."""
+    out = subprocess.run([sys.executable, str(SCRIPT), "--stage", stage, str(repo)],
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out)
+
+
+def ensure_repo(workdir: Path, size: int) -> Path:
+    repo = workdir / f"specs-{size}"
+    marker = repo / ".moai" / "bench-complete"
+    if not marker.exists():
+        generate(repo, size)
+        marker.write_text(str(size), encoding="utf-8")
+    return repo
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """Return a message per (size, stage) that regressed past the threshold."""
+    regressions = []
+    for size, stages in results["results"].items():
+        for stage, current in stages.items():
+            base = baseline.get("results", {}).get(size, {}).get(stage)
+            if not base:
+                continue
+            for key, floor in (("wall_s", MIN_WALL_DELTA_S), ("peak_rss_mb", MIN_RSS_DELTA_MB)):
+                limit = base[key] * (1 + threshold)
+                if current[key] > limit and current[key] - base[key] > floor:
+                    regressions.append(f"{size} SPECs / {stage}: {key} {current[key]} > {base[key]} (+{threshold:.0%})")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100,1000", help="comma-separated SPEC counts (e.g. 100,1000,10000)")
+    parser.add_argument("--stages", default=",".join(STAGES))
+    parser.add_argument("--workdir", type=Path, help="where synthetic repos are generated and reused")
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--save-baseline", type=Path, metavar="FILE")
+    parser.add_argument("--baseline", type=Path, metavar="FILE", help="fail on regressions against FILE")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative regression")
+    parser.add_argument("--stage", nargs=2, metavar=("NAME", "REPO"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.stage:
+        print(json.dumps(run_stage_inline(args.stage[0], Path(args.stage[1]))))
+        return 0
+
+    workdir = args.workdir or Path(tempfile.gettempdir(), "moai-bench")
+    results: dict[str, Any] = {
+        "meta": {"created": dt.datetime.now().astimezone().isoformat(timespec="seconds"),
+                 "python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "results": {},
+    }
+    for size in (int(s) for s in args.sizes.split(",")):
+        repo = ensure_repo(workdir, size)
+        for stage in args.stages.split(","):
+            result = run_stage(stage, repo)
+            results["results"].setdefault(str(size), {})[stage] = result
+            print(f"{size:>6} SPECs  {stage:<16} {result['wall_s']:>8.3f}s  {result['peak_rss_mb']:>7.1f} MB"
+                  f"  {result['files_per_s'] or 0:>10.0f} files/s", file=sys.stderr)
+
+    for path in filter(None, (args.output, args.save_baseline)):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.threshold)
+        for message in regressions:
+            print(f"❌ regression: {message}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
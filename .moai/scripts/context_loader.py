@@ -0,0 +1,228 @@
+"""Lazy, cached context loader for the Alfred JIT document strategy.
+
+Documents are split into sections keyed by their TAG anchor headings
+(`## @DOC:STACK-001 ...` → `DOC:STACK-001`; text outside any anchor is kept
+under `_unanchored`), memoized with mtime/size invalidation and evicted
+least-recently-used once the cache exceeds its byte budget. A command loads
+only the documents its JIT profile names, and only the sections asked for,
+and reports the bytes and estimated tokens it used. Requested sections are
+also looked up in the profile's optional documents; any that cannot be found
+are reported and make the command exit 1.
+
+When the sync daemon is running, the cache lives there and survives between
+commands; otherwise each process keeps its own.
+
+Usage:
+    python3 .moai/scripts/context_loader.py 1-plan --section DOC:MISSION-001
+    python3 .moai/scripts/context_loader.py 2-run --spec AUTH-001 --optional --budget-only
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from moai_core import find_project_root
+
+UNANCHORED = "_unanchored"
+WHOLE_DOCUMENT = "_document"
+DEFAULT_CACHE_BYTES = 4 * 1024 * 1024
+ANCHOR_HEADING = re.compile(r"^(#{1,6})\s+.*?@(DOC|SPEC|CODE|TEST):([A-Z][A-Z0-9]*(?:-[A-Z0-9]+)*-\d{3})")
+ANY_HEADING = re.compile(r"^(#{1,6})\s")
+
+# JIT table from development-guide.md: command → (required, optional) documents.
+COMMAND_PROFILES: dict[str, tuple[tuple[str, ...], tuple[str, ...]]] = {
+    "1-plan": ((".moai/project/product.md",), (".moai/project/structure.md", ".moai/project/tech.md")),
+    "2-run": ((".moai/specs/SPEC-{spec}/spec.md",), (".moai/memory/development-guide.md",)),
+    "3-sync": ((".moai/reports/sync-report.md",), (".moai/reports/tag-status.md",)),
+}
+
+
+@dataclass
+class ParsedDocument:
+    stamp: tuple[int, int]
+    text: str
+    sections: dict[str, str]
+
+    @property
+    def size(self) -> int:
+        return 2 * len(self.text)
+
+
+@dataclass
+class LoadedDocument:
+    path: str
+    sections: dict[str, str]
+    bytes: int
+    tokens: int
+    cached: bool
+
+
+@dataclass
+class ContextBundle:
+    command: str
+    documents: list[LoadedDocument] = field(default_factory=list)
+    missing: list[str] = field(default_factory=list)
+    unresolved: list[str] = field(default_factory=list)
+
+    @property
+    def bytes(self) -> int:
+        return sum(doc.bytes for doc in self.documents)
+
+    @property
+    def tokens(self) -> int:
+        return sum(doc.tokens for doc in self.documents)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "bytes": self.bytes, "tokens": self.tokens}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate: ~4 ASCII characters per token, one per non-ASCII (e.g. Hangul) character."""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def split_sections(text: str) -> dict[str, str]:
+    """Split markdown into sections keyed by TAG anchor; nested anchors share their lines."""
+    sections: dict[str, list[str]] = {UNANCHORED: []}
+    open_sections: list[tuple[int, str]] = []
+    in_fence = False
+    for line in text.splitlines(keepends=True):
+        if line.startswith(("```", "~~~")):
+            in_fence = not in_fence
+        heading = None if in_fence else ANY_HEADING.match(line)
+        if heading:
+            level = len(heading.group(1))
+            open_sections = [(lvl, key) for lvl, key in open_sections if lvl < level]
+            if anchor := ANCHOR_HEADING.match(line):
+                key = f"{anchor.group(2)}:{anchor.group(3)}"
+                sections.setdefault(key, [])
+                open_sections.append((level, key))
+        for key in [key for _, key in open_sections] or [UNANCHORED]:
+            sections[key].append(line)
+    return {key: "".join(lines) for key, lines in sections.items() if lines}
+
+
+class ContextCache:
+    """Byte-bounded LRU of parsed documents, invalidated by mtime and size."""
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._docs: OrderedDict[str, ParsedDocument] = OrderedDict()
+        self._bytes = 0
+
+    def get(self, path: Path) -> tuple[ParsedDocument, bool] | None:
+        """Return `(document, was_cached)`, or None when the file does not exist."""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            self._drop(str(path))
+            return None
+        key, stamp = str(path), (st.st_mtime_ns, st.st_size)
+        doc = self._docs.get(key)
+        if doc and doc.stamp == stamp:
+            self._docs.move_to_end(key)
+            return doc, True
+        self._drop(key)
+        text = path.read_text(encoding="utf-8")
+        doc = ParsedDocument(stamp, text, split_sections(text))
+        self._docs[key] = doc
+        self._bytes += doc.size
+        while self._bytes > self.max_bytes and len(self._docs) > 1:
+            self._drop(next(iter(self._docs)))
+        return doc, False
+
+    def _drop(self, key: str) -> None:
+        doc = self._docs.pop(key, None)
+        if doc:
+            self._bytes -= doc.size
+
+
+def load_context(
+    root: Path,
+    cache: ContextCache,
+    command: str,
+    spec: str | None = None,
+    sections: list[str] | None = None,
+    optional: bool = False,
+) -> ContextBundle:
+    """Load the documents of a command's JIT profile, keeping only the requested sections.
+
+    Requested sections are searched in the optional documents too; those found nowhere end up in
+    `bundle.unresolved`.
+    """
+    required, extra = COMMAND_PROFILES[command]
+    wanted = {s.lstrip("@") for s in sections or ()}
+    bundle = ContextBundle(command)
+    for template in (*required, *(extra if optional or wanted else ())):
+        if "{spec}" in template and not spec:
+            raise ValueError(f"/alfred:{command} needs a SPEC id")
+        rel = template.format(spec=spec)
+        found = cache.get(root / rel)
+        if found is None:
+            if optional or template in required:
+                bundle.missing.append(rel)
+            continue
+        doc, cached = found
+        picked = {k: v for k, v in doc.sections.items() if k in wanted} if wanted else {WHOLE_DOCUMENT: doc.text}
+        if wanted and not picked:
+            continue
+        text = "".join(picked.values())
+        bundle.documents.append(LoadedDocument(rel, picked, len(text.encode("utf-8")), estimate_tokens(text), cached))
+    bundle.unresolved = sorted(wanted.difference(*(doc.sections for doc in bundle.documents)))
+    return bundle
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=sorted(COMMAND_PROFILES))
+    parser.add_argument("--spec", help="SPEC id for /alfred:2-run (e.g. AUTH-001)")
+    parser.add_argument("--section", action="append", help="anchor to load, e.g. DOC:STACK-001 (repeatable)")
+    parser.add_argument("--optional", action="store_true", help="include the profile's optional documents")
+    parser.add_argument("--budget-only", action="store_true", help="print only the byte/token budget")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    from sync_daemon import query
+
+    root = find_project_root()
+    request = {"cmd": "context", "command": args.command, "spec": args.spec,
+               "sections": args.section, "optional": args.optional}
+    response = query(root, request)
+    if response and response.get("ok"):
+        result = response["bundle"]
+    else:
+        try:
+            result = load_context(root, ContextCache(), args.command, args.spec, args.section, args.optional).to_dict()
+        except ValueError as exc:
+            parser.error(str(exc))
+
+    unresolved = result.get("unresolved", [])
+    if args.json:
+        keys = ("command", "bytes", "tokens", "unresolved")
+        print(json.dumps(result if not args.budget_only else {k: result.get(k, []) for k in keys}, ensure_ascii=False))
+        return 1 if unresolved else 0
+    if not args.budget_only:
+        for doc in result["documents"]:
+            print("".join(doc["sections"].values()))
+    for doc in result["documents"]:
+        print(f"{doc['path']}: {doc['bytes']} B, ~{doc['tokens']} tokens"
+              f"{' (cached)' if doc['cached'] else ''}", file=sys.stderr)
+    for rel in result["missing"]:
+        print(f"{rel}: not found", file=sys.stderr)
+    for key in unresolved:
+        print(f"section {key} not found in the /alfred:{result['command']} documents", file=sys.stderr)
+    print(f"/alfred:{result['command']} context: {result['bytes']} B, ~{result['tokens']} tokens", file=sys.stderr)
+    return 1 if unresolved else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""File-system watchers for the sync daemon: inotify on Linux, polling elsewhere.
+
+Both watchers expose `poll(timeout) -> set[str]` returning absolute paths that
+changed since the last call. The `RESCAN` marker means events were lost (queue
+overflow) and the caller should fall back to a full refresh. `poll` raises
+`OSError` when the watcher can no longer follow the tree, e.g. when inotify
+runs out of watches (`ENOSPC`) for a newly created directory.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+from moai_core import SKIP_DIRS, iter_source_files
+
+RESCAN = "*"
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class PollingWatcher:
+    """Portable fallback: compares (mtime, size) snapshots of the watched trees."""
+
+    def __init__(self, root: Path, roots: tuple[str, ...], interval: float = 1.0) -> None:
+        self.root = root
+        self.roots = roots
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        snapshot = {}
+        for path in iter_source_files(self.root, self.roots):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            snapshot[str(path)] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def poll(self, timeout: float | None) -> set[str]:
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        current = self._scan()
+        changed = {p for p in current.keys() | self._snapshot.keys() if current.get(p) != self._snapshot.get(p)}
+        self._snapshot = current
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Recursive inotify watcher (via ctypes, no third-party dependency)."""
+
+    def __init__(self, root: Path, roots: tuple[str, ...]) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.root = root
+        self.roots = [root / rel for rel in roots]
+        self._dirs: dict[int, Path] = {}
+        for path in {root, *(p for rel in self.roots for p in (rel, *rel.parents) if p.is_relative_to(root))}:
+            if path.is_dir() and self._inside_roots(path):
+                self._watch_tree(path)
+            elif path.is_dir():
+                self._watch(path)
+
+    def _inside_roots(self, path: Path) -> bool:
+        return any(path == r or path.is_relative_to(r) for r in self.roots)
+
+    def _leads_to_root(self, path: Path) -> bool:
+        return any(r.is_relative_to(path) for r in self.roots)
+
+    def _watch(self, path: Path) -> None:
+        wd = self._add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err not in (errno.ENOENT, errno.ENOTDIR):
+                raise OSError(err, f"inotify_add_watch failed for {path}")
+            return
+        self._dirs[wd] = path
+
+    def _watch_tree(self, path: Path) -> set[str]:
+        """Watch `path` recursively; return the files already inside it."""
+        found = set()
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+            self._watch(Path(dirpath))
+            found.update(os.path.join(dirpath, name) for name in filenames)
+        return found
+
+    def poll(self, timeout: float | None) -> set[str]:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed: set[str] = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            changed |= self._decode(data)
+
+    def _decode(self, data: bytes) -> set[str]:
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                changed.add(RESCAN)
+                continue
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            parent = self._dirs.get(wd)
+            if parent is None or not name:
+                continue
+            path = parent / os.fsdecode(name)
+            if SKIP_DIRS.intersection(path.relative_to(self.root).parts):
+                continue
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and self._inside_roots(path):
+                    changed |= self._watch_tree(path)
+                elif mask & (IN_CREATE | IN_MOVED_TO) and self._leads_to_root(path):
+                    self._watch(path)
+                elif mask & (IN_DELETE | IN_MOVED_FROM) and self._inside_roots(path):
+                    changed.add(RESCAN)
+            elif self._inside_roots(path):
+                changed.add(str(path))
+        return changed
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def make_watcher(root: Path, roots: tuple[str, ...], force_polling: bool = False) -> InotifyWatcher | PollingWatcher:
+    """Return an inotify watcher where available, else a polling one."""
+    if not force_polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root, roots)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root, roots)
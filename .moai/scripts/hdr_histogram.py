@@ -0,0 +1,85 @@
+"""HDR-style latency histogram with bounded relative error.
+
+Values (integer microseconds) are bucketed log-linearly as in HdrHistogram:
+below `2**sub_bits` every value has its own bucket; above it each power of two
+is split into `2**(sub_bits - 1)` linear sub-buckets, so any recorded value is
+reported within `2 / 2**sub_bits` of its true value (0.1% with the default 11
+bits) however wide the range. Only non-empty buckets are stored, and
+histograms from several workers can be merged.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any
+
+DEFAULT_SUB_BITS = 11
+REPORTED_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+class Histogram:
+    def __init__(self, sub_bits: int = DEFAULT_SUB_BITS) -> None:
+        self.sub_bits = sub_bits
+        self.sub_count = 1 << sub_bits
+        self.half = self.sub_count >> 1
+        self.counts: dict[int, int] = {}
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        if value < self.sub_count:
+            return value
+        exp = value.bit_length() - self.sub_bits
+        return self.sub_count + (exp - 1) * self.half + (value >> exp) - self.half
+
+    def _highest_equivalent(self, index: int) -> int:
+        if index < self.sub_count:
+            return index
+        exp, offset = divmod(index - self.sub_count, self.half)
+        exp += 1
+        return ((self.half + offset + 1) << exp) - 1
+
+    def record(self, value: int, count: int = 1) -> None:
+        value = max(0, int(value))
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.min = value if not self.total else min(self.min, value)
+        self.max = max(self.max, value)
+        self.total += count
+
+    def merge(self, other: Histogram) -> None:
+        if other.sub_bits != self.sub_bits:
+            raise ValueError("cannot merge histograms with different precision")
+        if not other.total:
+            return
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.min = other.min if not self.total else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.total += other.total
+
+    def percentile(self, percent: float) -> int:
+        """Smallest bucket value such that `percent`% of recorded values are at or below it."""
+        if not self.total:
+            return 0
+        wanted = max(1, math.ceil(self.total * percent / 100 - 1e-9))  # tolerate float noise in e.g. 99.9
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= wanted:
+                return min(self._highest_equivalent(index), self.max)
+        return self.max
+
+    def mean(self) -> float:
+        if not self.total:
+            return 0.0
+        return sum(self._highest_equivalent(i) * n for i, n in self.counts.items()) / self.total
+
+    def summary(self, scale: float = 1.0) -> dict[str, Any]:
+        """Count, min/mean/max and the reported percentiles, divided by `scale` (e.g. 1000 for ms)."""
+        result: dict[str, Any] = {"count": self.total, "min": self.min / scale,
+                                  "mean": round(self.mean() / scale, 3), "max": self.max / scale}
+        for percent in REPORTED_PERCENTILES:
+            result[f"p{percent:g}".replace(".", "")] = self.percentile(percent) / scale
+        return result
@@ -0,0 +1,314 @@
+"""Columnar store of every SPEC's HISTORY for release notes and version alignment.
+
+Each change entry (`- **ADDED**: ...` under `### v0.2.0 (2025-10-23)`) becomes
+one row. Rows are kept column-wise in typed `array`s (spec, source path,
+major, minor, patch, date, change type, author, review, text), with strings
+interned into a single table, and persisted to `.moai/cache/history.bin`. A
+refresh re-parses only the spec.md files whose mtime/size changed, drops the
+rows that came from those files and appends the new ones.
+
+A header with an impossible date (`### v0.0.1 (2025-10-32)`) keeps its entries
+with an unknown date; one whose version does not fit the columns is skipped.
+Both are reported as warnings on every run until the SPEC is fixed.
+
+Usage:
+    python3 .moai/scripts/history_store.py changes --since 2025-10-01 --type BREAKING
+    python3 .moai/scripts/history_store.py stale-refs
+    python3 .moai/scripts/history_store.py bumps
+    python3 .moai/scripts/history_store.py release-notes --since 2025-10-01
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import os
+import re
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Iterable
+
+from moai_core import HISTORY_ENTRY, SPEC_GLOB, cache_dir, find_project_root, load_spec_header, relpath
+
+MAGIC = b"MOAIHST2"
+COLUMNS = {"spec": "I", "source": "I", "major": "H", "minor": "H", "patch": "H", "date": "i",
+           "change": "B", "author": "I", "review": "I", "text": "I"}
+STRING_COLUMNS = ("spec", "source", "author", "review", "text")
+MAX_VERSION_PART = 0xFFFF  # the "H" version columns
+CHANGE_TYPES = ("INITIAL", "ADDED", "CHANGED", "FIXED", "REMOVED", "BREAKING", "DEPRECATED", "UPDATED")
+CHANGE_CODES = {name: code for code, name in enumerate(CHANGE_TYPES)}
+BUMPS = ("none", "patch", "minor", "major")
+# development-guide.md "HISTORY Authoring Guide"; UPDATED is used by the project documents.
+CHANGE_BUMP = {"INITIAL": 0, "ADDED": 2, "CHANGED": 1, "FIXED": 1, "REMOVED": 3, "BREAKING": 3,
+               "DEPRECATED": 0, "UPDATED": 1}
+ENTRY_BULLET = re.compile(r"^- \*\*([A-Z]+)\*\*:\s*(.*)$")
+
+Row = tuple[tuple[int, int, int], int, str, str, str, str]
+
+
+def parse_history(lines: Iterable[str], warnings: list[str] | None = None) -> list[Row]:
+    """Return `(version, date_ordinal, change, author, review, text)` per change entry.
+
+    Malformed version headers are reported in `warnings` (see the module docstring).
+    """
+    warnings = [] if warnings is None else warnings
+    rows: list[Row] = []
+    block: dict[str, Any] | None = None
+    for line in [*lines, "### end"]:
+        match = HISTORY_ENTRY.match(line)
+        if match or line == "### end":
+            if block:
+                rows += [(block["version"], block["date"], change, block["author"], block["review"], text)
+                         for change, text in block["changes"]]
+            block = None
+            if match:
+                version = tuple(int(part) for part in match.group(1).split("."))
+                if max(version) > MAX_VERSION_PART:
+                    warnings.append(f"v{match.group(1)}: version parts above {MAX_VERSION_PART} are not supported;"
+                                    " entry skipped")
+                    continue
+                date = _date_ordinal(match.group(2))
+                if date is None:
+                    warnings.append(f"v{match.group(1)}: invalid date {match.group(2)}; stored as unknown")
+                block = {"version": version, "date": date or 0, "changes": [], "author": "", "review": ""}
+            continue
+        bullet = ENTRY_BULLET.match(line)
+        if not block or not bullet:
+            continue
+        key, text = bullet.groups()
+        if key in CHANGE_CODES:
+            block["changes"].append((key, text))
+        elif key in ("AUTHOR", "REVIEW"):
+            block[key.lower()] = text
+    return rows
+
+
+def _date_ordinal(value: str | None) -> int | None:
+    """Return the date's ordinal, 0 when there is none, or None when it is not a real date."""
+    if not value:
+        return 0
+    try:
+        return dt.date.fromisoformat(value).toordinal()
+    except ValueError:
+        return None
+
+
+def _version(value: Any) -> tuple[int, ...]:
+    try:
+        return tuple(int(part) for part in str(value).lstrip("v").split("."))
+    except ValueError:
+        return ()
+
+
+class HistoryStore:
+    def __init__(self, root: Path, path: Path | None = None) -> None:
+        self.root = root
+        self.path = path or cache_dir(root) / "history.bin"
+        self.cols = {name: array(code) for name, code in COLUMNS.items()}
+        self.strings: list[str] = [""]
+        self.files: dict[str, dict[str, Any]] = {}
+        self._load()
+        self._interned = {value: i for i, value in enumerate(self.strings)}
+
+    def __len__(self) -> int:
+        return len(self.cols["spec"])
+
+    def _load(self) -> None:
+        try:
+            data = self.path.read_bytes()
+            if not data.startswith(MAGIC):
+                return
+            (size,) = struct.unpack_from("<I", data, len(MAGIC))
+            offset = len(MAGIC) + 4
+            header = json.loads(data[offset:offset + size])
+        except (OSError, ValueError, struct.error):
+            return
+        if header.get("byteorder") != sys.byteorder:
+            return
+        offset += size
+        for name, col in self.cols.items():
+            width = header["rows"] * col.itemsize
+            col.frombytes(data[offset:offset + width])
+            offset += width
+        self.strings, self.files = header["strings"], header["files"]
+
+    def save(self) -> None:
+        header = json.dumps({"byteorder": sys.byteorder, "rows": len(self), "strings": self.strings,
+                             "files": self.files}, ensure_ascii=False).encode("utf-8")
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "wb") as handle:
+            handle.write(MAGIC + struct.pack("<I", len(header)) + header)
+            for col in self.cols.values():
+                col.tofile(handle)
+        os.replace(tmp, self.path)
+
+    def intern(self, value: str) -> int:
+        if value not in self._interned:
+            self._interned[value] = len(self.strings)
+            self.strings.append(value)
+        return self._interned[value]
+
+    def refresh(self) -> tuple[int, int]:
+        """Re-parse changed SPECs; return `(parsed, removed)`."""
+        current = {}
+        for path in self.root.glob(SPEC_GLOB):
+            st = os.stat(path)
+            current[relpath(self.root, path)] = (path, [st.st_mtime_ns, st.st_size])
+        changed = [rel for rel, (_, stamp) in current.items() if self.files.get(rel, {}).get("stamp") != stamp]
+        removed = [rel for rel in self.files if rel not in current]
+        if not changed and not removed:
+            return 0, 0
+        stale = {self.intern(rel) for rel in (*changed, *removed) if rel in self.files}
+        keep = [i for i, source in enumerate(self.cols["source"]) if source not in stale]
+        if len(keep) != len(self):
+            self.cols = {name: array(col.typecode, (col[i] for i in keep)) for name, col in self.cols.items()}
+        for rel in removed:
+            del self.files[rel]
+        for rel in changed:
+            self._append(rel, *current[rel])
+        self._compact_strings()
+        self.save()
+        return len(changed), len(removed)
+
+    def _append(self, rel: str, path: Path, stamp: list[int]) -> None:
+        header = load_spec_header(path)
+        spec_id = str(header.front_matter.get("id") or path.parent.name.removeprefix("SPEC-"))
+        warnings: list[str] = []
+        rows = parse_history(header.history_lines, warnings)
+        self.files[rel] = {"stamp": stamp, "spec": spec_id, "version": str(header.front_matter.get("version", "")),
+                           "warnings": warnings}
+        spec, source = self.intern(spec_id), self.intern(rel)
+        for (major, minor, patch), date, change, author, review, text in rows:
+            for name, value in (("spec", spec), ("source", source), ("major", major), ("minor", minor),
+                                ("patch", patch), ("date", date), ("change", CHANGE_CODES[change]),
+                                ("author", self.intern(author)), ("review", self.intern(review)),
+                                ("text", self.intern(text))):
+                self.cols[name].append(value)
+
+    def _compact_strings(self) -> None:
+        """Drop strings no longer referenced by any row or file entry."""
+        used = {0, *(i for name in STRING_COLUMNS for i in self.cols[name])}
+        used |= {self._interned[entry["spec"]] for entry in self.files.values()}
+        if len(used) == len(self.strings):
+            return
+        remap = {old: new for new, old in enumerate(sorted(used))}
+        self.strings = [self.strings[old] for old in sorted(used)]
+        self._interned = {value: i for i, value in enumerate(self.strings)}
+        for name in STRING_COLUMNS:
+            self.cols[name] = array("I", (remap[i] for i in self.cols[name]))
+
+    def warnings(self) -> list[str]:
+        """Malformed HISTORY headers of the stored SPECs, as `path: problem`."""
+        return [f"{rel}: {warning}" for rel, entry in sorted(self.files.items())
+                for warning in entry.get("warnings", [])]
+
+    def row(self, i: int) -> dict[str, Any]:
+        c = self.cols
+        date = c["date"][i]
+        return {
+            "spec": self.strings[c["spec"][i]],
+            "version": f"{c['major'][i]}.{c['minor'][i]}.{c['patch'][i]}",
+            "date": dt.date.fromordinal(date).isoformat() if date else None,
+            "change": CHANGE_TYPES[c["change"][i]],
+            "author": self.strings[c["author"][i]],
+            "review": self.strings[c["review"][i]],
+            "text": self.strings[c["text"][i]],
+        }
+
+    def changes(self, since: dt.date | None = None, types: Iterable[str] = ()) -> list[dict[str, Any]]:
+        """Rows dated on/after `since` whose change type is in `types` (all types when empty)."""
+        floor = since.toordinal() if since else 0
+        codes = {CHANGE_CODES[t] for t in types} or set(CHANGE_CODES.values())
+        hits = [i for i, (date, code) in enumerate(zip(self.cols["date"], self.cols["change"]))
+                if date >= floor and code in codes]
+        return [self.row(i) for i in hits]
+
+    def stale_refs(self, refs: Iterable[Any]) -> list[dict[str, Any]]:
+        """References (`SPEC-{ID}.md vX.Y.Z`) that point at an older version than the SPEC's current one."""
+        current = {entry["spec"]: entry["version"] for entry in self.files.values()}
+        stale = []
+        for ref in refs:
+            latest = current.get(ref.spec_id)
+            if latest and _version(ref.version) < _version(latest):
+                stale.append({"spec": ref.spec_id, "referenced": ref.version, "current": latest,
+                              "path": ref.path, "line": ref.line})
+        return stale
+
+    def bump_mismatches(self) -> list[dict[str, Any]]:
+        """Versions whose bump is smaller than their change types imply (0.x caps major-level changes at minor)."""
+        blocks: dict[tuple[int, int, int, int], int] = {}
+        c = self.cols
+        for spec, major, minor, patch, code in zip(c["spec"], c["major"], c["minor"], c["patch"], c["change"]):
+            key = (spec, major, minor, patch)
+            blocks[key] = max(blocks.get(key, 0), CHANGE_BUMP[CHANGE_TYPES[code]])
+        mismatches = []
+        previous: tuple[int, int, int, int] | None = None
+        for key in sorted(blocks):
+            if previous and previous[0] == key[0]:
+                actual = 3 if key[1] != previous[1] else 2 if key[2] != previous[2] else 1 if key[3] != previous[3] else 0
+                implied = min(blocks[key], 2) if key[1] == 0 else blocks[key]
+                if actual < implied:
+                    mismatches.append({"spec": self.strings[key[0]], "version": "{}.{}.{}".format(*key[1:]),
+                                       "from": "{}.{}.{}".format(*previous[1:]),
+                                       "actual": BUMPS[actual], "implied": BUMPS[implied]})
+            previous = key
+        return mismatches
+
+
+def release_notes(rows: list[dict[str, Any]]) -> str:
+    lines = []
+    for spec in sorted({row["spec"] for row in rows}):
+        lines.append(f"### SPEC-{spec}")
+        lines += [f"- v{r['version']} **{r['change']}**: {r['text']}" for r in rows if r["spec"] == spec]
+        lines.append("")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--json", action="store_true")
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("refresh")
+    for name in ("changes", "release-notes"):
+        cmd = sub.add_parser(name, parents=[common])
+        cmd.add_argument("--since", type=dt.date.fromisoformat, help="YYYY-MM-DD")
+        cmd.add_argument("--type", action="append", default=[], choices=CHANGE_TYPES)
+    sub.add_parser("stale-refs", parents=[common], help="code referencing an older SPEC version")
+    sub.add_parser("bumps", parents=[common], help="versions bumped less than their changes imply")
+    args = parser.parse_args(argv)
+
+    root = find_project_root()
+    store = HistoryStore(root)
+    parsed, removed = store.refresh()
+    for warning in store.warnings():
+        print(f"⚠️  {warning}", file=sys.stderr)
+    if args.command == "refresh":
+        print(f"{len(store)} HISTORY rows; re-parsed {parsed}, removed {removed} SPEC(s)")
+        return 0
+    if args.command in ("changes", "release-notes"):
+        result = store.changes(args.since, args.type)
+    elif args.command == "stale-refs":
+        from tag_index import TagIndex
+
+        with TagIndex(root) as index:
+            index.refresh()
+            result = store.stale_refs(index.version_refs())
+    else:
+        result = store.bump_mismatches()
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False))
+    elif args.command == "release-notes":
+        print(release_notes(result))
+    else:
+        for row in result:
+            print("  ".join(f"{key}={value}" for key, value in row.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,336 @@
+"""Open-loop load harness for the product / order / payment / inventory flows.
+
+A scenario file (`.moai/loadgen/scenarios/*.json`) names weighted flows, such
+as browse → cart → order → pay or direct stock decrements on hot SKUs, plus
+an arrival rate. Flows start on a Poisson (or constant) schedule whether or
+not earlier ones have finished, and each latency is measured from the
+*scheduled* start, so a stalled backend shows up in the tail instead of
+silently lowering the offered load. Requests share a keep-alive connection
+pool. Latencies of every outcome go into HDR-style histograms (p50/p99/p99.9
+per step and per flow). Flows still running `DRAIN_TIMEOUT_S` after the last
+arrival are cancelled and counted as `unknown`, timed from their scheduled
+start. Afterwards an inventory checker compares stock before and after with
+the reservations the backend confirmed, and reports oversold SKUs.
+
+Without `--target`, the in-process stand-in API (loadgen_backend.py) is
+started and seeded from the scenario, so no JVM service or database is needed.
+`--sweep` repeats the run at several rates to find where the SLO breaks.
+
+Usage:
+    python3 .moai/scripts/loadgen.py checkout --duration 10
+    python3 .moai/scripts/loadgen.py hot-sku --locking none       # oversell demo
+    python3 .moai/scripts/loadgen.py checkout --sweep 100,200,400,800 --slo-p99-ms 50
+    python3 .moai/scripts/loadgen.py checkout --target http://localhost:8080 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from hdr_histogram import Histogram
+from loadgen_backend import LOCKING_MODES, StandInBackend, sku_name
+from loadgen_client import HttpError, HttpPool
+from moai_core import find_project_root
+
+SCENARIO_DIR = ".moai/loadgen/scenarios"
+ARRIVAL_PROCESSES = ("poisson", "constant")
+DRAIN_TIMEOUT_S = 10.0
+MAX_ERROR_RATE = 0.01
+MIN_ACHIEVED_RATIO = 0.95
+OPS = ("browse", "view", "cart", "add", "order", "pay", "decrement")
+# Ops that use state from an earlier step of the same flow.
+REQUIRES = {"add": "cart", "order": "cart", "pay": "order"}
+
+
+@dataclass
+class Scenario:
+    name: str
+    flows: list[dict[str, Any]]
+    rate: float
+    duration_s: float = 10.0
+    process: str = "poisson"
+    connections: int = 64
+    timeout_s: float = 5.0
+    max_in_flight: int = 10000
+    seed: dict[str, int] = field(default_factory=lambda: {"products": 1000, "stock": 1000})
+    backend: dict[str, Any] = field(default_factory=dict)
+    random_seed: int = 42
+
+
+@dataclass
+class RunStats:
+    ops: dict[str, Histogram] = field(default_factory=lambda: defaultdict(Histogram))
+    outcomes: dict[str, Counter[str]] = field(default_factory=lambda: defaultdict(Counter))
+    confirmed: Counter[str] = field(default_factory=Counter)
+    unknown: Counter[str] = field(default_factory=Counter)
+    started: int = 0
+    dropped: int = 0
+    cancelled: int = 0
+    elapsed_s: float = 0.0
+
+    def record(self, name: str, latency_s: float, outcome: str) -> None:
+        self.outcomes[name][outcome] += 1
+        self.ops[name].record(int(latency_s * 1_000_000))
+
+
+def load_scenario(ref: str, root: Path) -> Scenario:
+    """Load a scenario by path or by name from `.moai/loadgen/scenarios/`."""
+    path = Path(ref) if ref.endswith(".json") else root / SCENARIO_DIR / f"{ref}.json"
+    data = json.loads(path.read_text(encoding="utf-8"))
+    arrival = data.pop("arrival", {})
+    data.pop("description", None)
+    scenario = Scenario(rate=float(arrival.get("rate", 50)), process=arrival.get("process", "poisson"), **data)
+    if scenario.process not in ARRIVAL_PROCESSES:
+        raise ValueError(f"{path}: arrival.process must be one of {ARRIVAL_PROCESSES}")
+    for flow in scenario.flows:
+        ops = [step["op"] for step in flow["steps"]]
+        for i, op in enumerate(ops):
+            if op not in OPS:
+                raise ValueError(f"{path}: flow {flow['name']!r} uses unknown op {op!r}")
+            if op in REQUIRES and REQUIRES[op] not in ops[:i]:
+                raise ValueError(f"{path}: flow {flow['name']!r} needs {REQUIRES[op]!r} before {op!r}")
+    return scenario
+
+
+def _pick_sku(step: dict[str, Any], seed: dict[str, int], rng: random.Random) -> str:
+    choice = step.get("sku", "any")
+    if choice == "hot":
+        return sku_name(rng.randrange(max(1, seed.get("hot_skus", 1))))
+    if choice == "any":
+        return sku_name(rng.randrange(seed["products"]))
+    return choice
+
+
+def _request(op: str, step: dict[str, Any], session: dict[str, Any], scenario: Scenario,
+             rng: random.Random) -> tuple[str, str, Any]:
+    quantity = int(step.get("quantity", 1))
+    if op == "browse":
+        return "GET", f"/api/products?page={rng.randrange(int(step.get('pages', 10)))}&size=20", None
+    if op == "view":
+        return "GET", f"/api/products/{_pick_sku(step, scenario.seed, rng)}", None
+    if op == "cart":
+        return "POST", "/api/carts", None
+    if op == "add":
+        session["pending"] = (_pick_sku(step, scenario.seed, rng), quantity)
+        return "POST", f"/api/carts/{session['cartId']}/items", {"sku": session["pending"][0], "quantity": quantity}
+    if op == "order":
+        return "POST", "/api/orders", {"cartId": session["cartId"]}
+    if op == "pay":
+        return "POST", "/api/payments", {"orderId": session["orderId"], "amount": session["amount"]}
+    session["pending"] = (_pick_sku(step, scenario.seed, rng), quantity)
+    return "POST", f"/api/inventory/{session['pending'][0]}/decrement", {"quantity": quantity}
+
+
+def _settle(op: str, outcome: str, payload: Any, session: dict[str, Any], stats: RunStats) -> None:
+    """Carry response state to the next step and book stock the backend confirmed (or may have) taken."""
+    reserved: dict[str, int] = {}
+    if op == "order":
+        reserved = dict(session["items"])
+    elif op == "decrement":
+        reserved = dict([session["pending"]])
+    if outcome == "ok":
+        stats.confirmed.update(reserved)
+        if op == "cart":
+            session["cartId"], session["items"] = payload["cartId"], Counter()
+        elif op == "add":
+            session["items"][session["pending"][0]] += session["pending"][1]
+        elif op == "order":
+            session["orderId"], session["amount"] = payload["orderId"], payload["amount"]
+    elif outcome == "unknown":
+        stats.unknown.update(reserved)
+
+
+async def run_flow(flow: dict[str, Any], scheduled: float, pool: HttpPool, scenario: Scenario,
+                   rng: random.Random, stats: RunStats) -> None:
+    loop = asyncio.get_running_loop()
+    session: dict[str, Any] = {}
+    step_start = scheduled
+    for step in flow["steps"]:
+        method, path, body = _request(step["op"], step, session, scenario, rng)
+        try:
+            status, payload = await pool.request(method, path, body)
+            outcome = "ok" if 200 <= status < 300 else "rejected" if status == 409 else "error"
+        except (OSError, HttpError, asyncio.TimeoutError):
+            payload, outcome = None, "unknown"
+        except asyncio.CancelledError:
+            # Cut off by the end-of-run drain: the request may or may not have been applied.
+            now = loop.time()
+            stats.cancelled += 1
+            stats.record(step["op"], now - step_start, "unknown")
+            _settle(step["op"], "unknown", None, session, stats)
+            stats.record(f"flow:{flow['name']}", now - scheduled, "unknown")
+            raise
+        now = loop.time()
+        stats.record(step["op"], now - step_start, outcome)
+        _settle(step["op"], outcome, payload, session, stats)
+        if outcome != "ok":
+            stats.record(f"flow:{flow['name']}", now - scheduled, outcome)
+            return
+        step_start = now
+    stats.record(f"flow:{flow['name']}", loop.time() - scheduled, "ok")
+
+
+async def drive(pool: HttpPool, scenario: Scenario, rate: float) -> RunStats:
+    """Start flows open-loop at `rate` per second for the scenario's duration.
+
+    Returns once every flow has finished or, after the drain timeout, been cancelled and recorded.
+    """
+    loop = asyncio.get_running_loop()
+    rng = random.Random(scenario.random_seed)
+    weights = [flow.get("weight", 1) for flow in scenario.flows]
+    stats, in_flight = RunStats(), set()
+    begin = next_at = loop.time() + 0.05
+    while next_at < begin + scenario.duration_s:
+        if (delay := next_at - loop.time()) > 0:
+            await asyncio.sleep(delay)
+        if len(in_flight) >= scenario.max_in_flight:
+            stats.dropped += 1
+        else:
+            flow = rng.choices(scenario.flows, weights)[0]
+            task = asyncio.create_task(run_flow(flow, next_at, pool, scenario, random.Random(rng.random()), stats))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+            stats.started += 1
+        next_at += rng.expovariate(rate) if scenario.process == "poisson" else 1 / rate
+    if in_flight:
+        await asyncio.wait(in_flight, timeout=DRAIN_TIMEOUT_S)
+    stats.elapsed_s = loop.time() - begin
+    leftover = list(in_flight)
+    for task in leftover:
+        task.cancel()
+    await asyncio.gather(*leftover, return_exceptions=True)
+    return stats
+
+
+def check_inventory(before: dict[str, int], after: dict[str, int], stats: RunStats) -> list[dict[str, Any]]:
+    """SKUs whose stock went negative, sold more than existed, or disagrees with confirmed reservations.
+
+    Reservations whose response was lost (timeouts) may or may not have been applied; they widen the
+    tolerance for the ledger comparison instead of being counted either way.
+    """
+    violations = []
+    for sku in sorted(set(stats.confirmed) | set(stats.unknown) | {s for s, n in after.items() if n < 0}):
+        start, end = before.get(sku, 0), after.get(sku, 0)
+        confirmed, unsure = stats.confirmed[sku], stats.unknown[sku]
+        problems = []
+        if end < 0:
+            problems.append("negative stock")
+        if confirmed > start:
+            problems.append("oversold")
+        if abs((start - end) - confirmed) > unsure:
+            problems.append("lost update")
+        if problems:
+            violations.append({"sku": sku, "initial": start, "final": end, "confirmed": confirmed,
+                               "unknown": unsure, "problems": problems})
+    return violations
+
+
+async def run_once(scenario: Scenario, rate: float, target: str | None) -> dict[str, Any]:
+    backend = None
+    if target is None:
+        backend = StandInBackend(**scenario.backend)
+        backend.seed(**scenario.seed)
+        server = await backend.start()
+        target = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+    pool = HttpPool(target, scenario.connections, scenario.timeout_s)
+    try:
+        _, before = await pool.request("GET", "/api/inventory")
+        stats = await drive(pool, scenario, rate)
+        _, after = await pool.request("GET", "/api/inventory")
+    finally:
+        await pool.close()
+        if backend:
+            await backend.stop()
+    return report(scenario, rate, stats, check_inventory(before, after, stats), pool.opened)
+
+
+def report(scenario: Scenario, rate: float, stats: RunStats, violations: list[dict[str, Any]],
+           connections: int) -> dict[str, Any]:
+    ops = {}
+    for name in sorted(stats.outcomes, key=lambda n: (n.startswith("flow:"), n)):
+        ops[name] = {**stats.ops[name].summary(scale=1000), **stats.outcomes[name]}
+        ops[name]["count"] = sum(stats.outcomes[name].values())
+    flows = [v for k, v in ops.items() if k.startswith("flow:")]
+    total = sum(f["count"] for f in flows)
+    failed = sum(f.get("error", 0) + f.get("unknown", 0) for f in flows)
+    finished = total - stats.cancelled
+    return {"scenario": scenario.name, "offered_rate": rate, "achieved_rate": round(finished / stats.elapsed_s, 1),
+            "started": stats.started, "dropped": stats.dropped, "cancelled": stats.cancelled,
+            "connections": connections, "error_rate": round(failed / total, 4) if total else 0.0, "ops": ops, "violations": violations}
+
+
+def format_report(result: dict[str, Any]) -> str:
+    lines = [f"{result['scenario']}: offered {result['offered_rate']:g}/s, achieved {result['achieved_rate']:g}/s, "
+             f"{result['started']} flows, {result['dropped']} dropped, {result['cancelled']} cancelled, "
+             f"{result['connections']} connections",
+             f"{'op':<22}{'count':>8}{'ok':>8}{'409':>6}{'err':>6}{'p50 ms':>10}{'p99 ms':>10}{'p99.9 ms':>10}{'max ms':>10}"]
+    for name, op in result["ops"].items():
+        lines.append(f"{name:<22}{op['count']:>8}{op.get('ok', 0):>8}{op.get('rejected', 0):>6}"
+                     f"{op.get('error', 0) + op.get('unknown', 0):>6}{op['p50']:>10.2f}{op['p99']:>10.2f}"
+                     f"{op['p999']:>10.2f}{op['max']:>10.2f}")
+    for v in result["violations"]:
+        lines.append(f"❌ {v['sku']}: {', '.join(v['problems'])} (initial {v['initial']}, final {v['final']}, "
+                     f"confirmed {v['confirmed']}, unknown {v['unknown']})")
+    if not result["violations"]:
+        lines.append("✅ inventory consistent: no oversold SKUs")
+    return "\n".join(lines)
+
+
+def within_slo(result: dict[str, Any], slo_p99_ms: float) -> bool:
+    flows = [op for name, op in result["ops"].items() if name.startswith("flow:")]
+    return (all(op["p99"] <= slo_p99_ms for op in flows) and result["error_rate"] <= MAX_ERROR_RATE
+            and result["achieved_rate"] >= MIN_ACHIEVED_RATIO * result["offered_rate"] and not result["dropped"])
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scenario", help=f"scenario name (from {SCENARIO_DIR}/) or path to a .json file")
+    parser.add_argument("--target", help="base URL of a running service; default: in-process stand-in")
+    parser.add_argument("--rate", type=float, help="override the scenario's arrival rate (flows/s)")
+    parser.add_argument("--duration", type=float, help="override the scenario's duration (s)")
+    parser.add_argument("--connections", type=int, help="override the connection pool size")
+    parser.add_argument("--latency-ms", type=float, help="stand-in: simulated DB round-trip")
+    parser.add_argument("--locking", choices=LOCKING_MODES, help="stand-in: stock locking mode")
+    parser.add_argument("--sweep", help="comma-separated rates to run one after another")
+    parser.add_argument("--slo-p99-ms", type=float, help="with --sweep, report the highest rate within this p99")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    try:
+        scenario = load_scenario(args.scenario, find_project_root())
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        parser.error(f"cannot load scenario {args.scenario!r}: {exc}")
+    for key, value in (("duration_s", args.duration), ("connections", args.connections)):
+        if value is not None:
+            setattr(scenario, key, value)
+    for key, value in (("latency_ms", args.latency_ms), ("locking", args.locking)):
+        if value is not None:
+            scenario.backend[key] = value
+    rates = [float(r) for r in args.sweep.split(",")] if args.sweep else [args.rate or scenario.rate]
+
+    results = []
+    for rate in rates:
+        result = asyncio.run(run_once(scenario, rate, args.target))
+        results.append(result)
+        if not args.json:
+            print(format_report(result) + "\n")
+    if args.slo_p99_ms is not None:
+        passing = [r["offered_rate"] for r in results if within_slo(r, args.slo_p99_ms)]
+        limit = max(passing, default=None)
+        if not args.json:
+            print(f"highest rate within p99 ≤ {args.slo_p99_ms:g} ms: {f'{limit:g}/s' if limit else 'none'}")
+    if args.json:
+        print(json.dumps(results if args.sweep else results[0], ensure_ascii=False))
+    return 1 if any(r["violations"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
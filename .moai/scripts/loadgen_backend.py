@@ -0,0 +1,237 @@
+"""In-process stand-in for the shop REST API, used by the load harness offline.
+
+Implements the product / cart / order / payment / inventory endpoints the
+Spring Boot service is planned to expose, over plain asyncio HTTP/1.1 with
+keep-alive. Every storage access awaits a simulated database round-trip
+(`latency_ms`), so contention behaves like a real store rather than like
+in-memory dicts. Stock changes take a per-SKU lock (acquired in SKU order);
+`locking="none"` drops the locks and turns reservations into read-modify-write
+races, which the harness' oversell checker is expected to catch.
+
+    GET  /api/products?page=N&size=M       POST /api/carts
+    GET  /api/products/{sku}               POST /api/carts/{cartId}/items   {sku, quantity}
+    GET  /api/inventory                    POST /api/orders                 {cartId}
+    POST /api/inventory/{sku}/decrement    POST /api/payments               {orderId, amount}
+    POST /api/admin/seed  {products, stock, hot_skus, hot_stock}   (stand-in only)
+
+Usage:
+    python3 .moai/scripts/loadgen_backend.py --port 8080 [--latency-ms 1] [--locking none]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import re
+import sys
+from contextlib import AsyncExitStack
+from typing import Any, Awaitable, Callable
+from urllib.parse import parse_qs, urlsplit
+
+from loadgen_client import HttpError, encode_message, read_message
+
+LOCKING_MODES = ("sku", "none")
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 409: "Conflict"}
+
+Response = tuple[int, Any]
+
+
+def sku_name(n: int) -> str:
+    return f"SKU-{n:05d}"
+
+
+class StandInBackend:
+    def __init__(self, latency_ms: float = 0.0, locking: str = "sku") -> None:
+        if locking not in LOCKING_MODES:
+            raise ValueError(f"locking must be one of {LOCKING_MODES}")
+        self.latency = latency_ms / 1000
+        self.locking = locking
+        self.products: dict[str, dict[str, Any]] = {}
+        self.locks: dict[str, asyncio.Lock] = {}
+        self.carts: dict[int, dict[str, int]] = {}
+        self.orders: dict[int, dict[str, Any]] = {}
+        self.payments: dict[int, int] = {}
+        self._ids = itertools.count(1)
+        self._connections: dict[asyncio.Task[None], asyncio.StreamWriter] = {}
+        self._server: asyncio.Server | None = None
+        self.seed()
+        self.routes: list[tuple[str, re.Pattern[str], Callable[..., Awaitable[Response]]]] = [
+            ("GET", re.compile(r"/api/products"), self.list_products),
+            ("GET", re.compile(r"/api/products/([^/]+)"), self.get_product),
+            ("GET", re.compile(r"/api/inventory"), self.inventory),
+            ("POST", re.compile(r"/api/inventory/([^/]+)/decrement"), self.decrement),
+            ("POST", re.compile(r"/api/carts"), self.create_cart),
+            ("POST", re.compile(r"/api/carts/(\d+)/items"), self.add_item),
+            ("POST", re.compile(r"/api/orders"), self.create_order),
+            ("POST", re.compile(r"/api/payments"), self.pay),
+            ("POST", re.compile(r"/api/admin/seed"), self.reseed),
+        ]
+
+    def seed(self, products: int = 1000, stock: int = 1000, hot_skus: int = 0, hot_stock: int = 100) -> None:
+        """Reset the catalogue; the first `hot_skus` SKUs get `hot_stock` units, the rest `stock`."""
+        self.products = {sku_name(n): {"sku": sku_name(n), "name": f"Product {n}", "price": 1000 + n % 97 * 100,
+                                       "stock": hot_stock if n < hot_skus else stock} for n in range(products)}
+        self.locks = {sku: asyncio.Lock() for sku in self.products}
+        self.carts.clear()
+        self.orders.clear()
+        self.payments.clear()
+
+    async def _db(self) -> None:
+        """One simulated database round-trip; always yields to the event loop."""
+        await asyncio.sleep(self.latency)
+
+    async def dispatch(self, method: str, target: str, body: Any) -> Response:
+        url = urlsplit(target)
+        for verb, pattern, handler in self.routes:
+            match = pattern.fullmatch(url.path)
+            if verb == method and match:
+                try:
+                    return await handler(*match.groups(), body=body or {}, query=parse_qs(url.query))
+                except (KeyError, TypeError, ValueError) as exc:
+                    return 400, {"error": "BAD_REQUEST", "detail": str(exc)}
+        return 404, {"error": "NOT_FOUND"}
+
+    async def list_products(self, body: Any, query: dict[str, list[str]]) -> Response:
+        page, size = int(query.get("page", ["0"])[0]), int(query.get("size", ["20"])[0])
+        await self._db()
+        skus = list(self.products)[page * size:(page + 1) * size]
+        return 200, [self.products[sku] for sku in skus]
+
+    async def get_product(self, sku: str, body: Any, query: Any) -> Response:
+        await self._db()
+        return (200, self.products[sku]) if sku in self.products else (404, {"error": "NOT_FOUND"})
+
+    async def inventory(self, body: Any, query: Any) -> Response:
+        await self._db()
+        return 200, {sku: product["stock"] for sku, product in self.products.items()}
+
+    async def create_cart(self, body: Any, query: Any) -> Response:
+        await self._db()
+        cart_id = next(self._ids)
+        self.carts[cart_id] = {}
+        return 201, {"cartId": cart_id}
+
+    async def add_item(self, cart_id: str, body: dict[str, Any], query: Any) -> Response:
+        cart, sku, quantity = self.carts.get(int(cart_id)), body["sku"], int(body.get("quantity", 1))
+        if cart is None or sku not in self.products:
+            return 404, {"error": "NOT_FOUND"}
+        if quantity < 1:
+            return 400, {"error": "INVALID_QUANTITY"}
+        await self._db()
+        cart[sku] = cart.get(sku, 0) + quantity
+        return 200, {"cartId": int(cart_id), "items": cart}
+
+    async def _reserve(self, items: dict[str, int]) -> str | None:
+        """Take `items` out of stock atomically (per the locking mode); return the short SKU on failure."""
+        async with AsyncExitStack() as stack:
+            if self.locking == "sku":
+                for sku in sorted(items):
+                    await stack.enter_async_context(self.locks[sku])
+            seen = {}
+            for sku in items:
+                await self._db()
+                seen[sku] = self.products[sku]["stock"]
+            short = next((sku for sku, qty in items.items() if seen[sku] < qty), None)
+            if short:
+                return short
+            await self._db()
+            for sku, qty in items.items():
+                self.products[sku]["stock"] = seen[sku] - qty
+        return None
+
+    async def decrement(self, sku: str, body: dict[str, Any], query: Any) -> Response:
+        if sku not in self.products:
+            return 404, {"error": "NOT_FOUND"}
+        if await self._reserve({sku: int(body.get("quantity", 1))}):
+            return 409, {"error": "OUT_OF_STOCK", "sku": sku}
+        return 200, {"sku": sku, "stock": self.products[sku]["stock"]}
+
+    async def create_order(self, body: dict[str, Any], query: Any) -> Response:
+        cart = self.carts.pop(int(body["cartId"]), None)
+        if not cart:
+            return 404, {"error": "CART_NOT_FOUND"}
+        if short := await self._reserve(cart):
+            return 409, {"error": "OUT_OF_STOCK", "sku": short}
+        order_id = next(self._ids)
+        amount = sum(self.products[sku]["price"] * qty for sku, qty in cart.items())
+        self.orders[order_id] = {"orderId": order_id, "items": cart, "amount": amount, "status": "CREATED"}
+        return 201, self.orders[order_id]
+
+    async def pay(self, body: dict[str, Any], query: Any) -> Response:
+        order = self.orders.get(int(body["orderId"]))
+        if order is None:
+            return 404, {"error": "ORDER_NOT_FOUND"}
+        if int(body.get("amount", -1)) != order["amount"]:
+            return 400, {"error": "AMOUNT_MISMATCH"}
+        await self._db()
+        if order["status"] == "PAID":
+            return 409, {"error": "ALREADY_PAID"}
+        order["status"] = "PAID"
+        self.payments[order["orderId"]] = order["amount"]
+        return 201, {"paymentId": order["orderId"], "status": "PAID"}
+
+    async def reseed(self, body: dict[str, Any], query: Any) -> Response:
+        self.seed(**{k: int(v) for k, v in body.items() if k in ("products", "stock", "hot_skus", "hot_stock")})
+        return 200, {"products": len(self.products)}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        assert task is not None
+        self._connections[task] = writer
+        try:
+            while True:
+                start, headers, raw = await read_message(reader)
+                method, target, _ = start.split(" ", 2)
+                status, payload = await self.dispatch(method, target, json.loads(raw) if raw else None)
+                keep_alive = headers.get("connection", "keep-alive").lower() != "close"
+                writer.write(encode_message(f"HTTP/1.1 {status} {REASONS.get(status, '')}", payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, HttpError, ValueError):
+            pass
+        finally:
+            del self._connections[task]
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.Server:
+        """Listen on `host:port` (0 picks a free port; see `server.sockets[0].getsockname()`)."""
+        self._server = await asyncio.start_server(self.handle_connection, host, port, backlog=1024)
+        return self._server
+
+    async def stop(self) -> None:
+        """Stop listening, close open connections and wait for their handlers to finish."""
+        if self._server:
+            self._server.close()
+        for writer in self._connections.values():
+            writer.close()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    backend = StandInBackend(args.latency_ms, args.locking)
+    server = await backend.start(args.host, args.port)
+    print(f"stand-in API on http://{args.host}:{server.sockets[0].getsockname()[1]} (locking={args.locking})",
+          file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated DB round-trip per access")
+    parser.add_argument("--locking", choices=LOCKING_MODES, default="sku")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""Minimal asyncio HTTP/1.1 client with a keep-alive connection pool.
+
+Only what the load harness needs: JSON request/response bodies framed by
+Content-Length, persistent connections, and a bounded pool so the number of
+sockets (and therefore server-side connections) is a scenario parameter. A
+connection that errors or times out is closed instead of being returned.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+from urllib.parse import urlsplit
+
+MAX_HEADER_BYTES = 64 * 1024
+
+
+class HttpError(Exception):
+    pass
+
+
+async def read_message(reader: asyncio.StreamReader) -> tuple[str, dict[str, str], bytes]:
+    """Read one HTTP/1.1 message; return `(start_line, lowercased headers, body)`."""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.LimitOverrunError as exc:
+        raise HttpError("header section too large") from exc
+    if len(head) > MAX_HEADER_BYTES:
+        raise HttpError("header section too large")
+    start, *lines = head.decode("latin-1").split("\r\n")
+    headers = {}
+    for line in filter(None, lines):
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers.get("content-length", 0)))
+    return start, headers, body
+
+
+def encode_message(start: str, body: Any = None, keep_alive: bool = True, host: str | None = None) -> bytes:
+    payload = b"" if body is None else json.dumps(body).encode()
+    headers = [start]
+    if host:
+        headers.append(f"Host: {host}")
+    headers += [f"Content-Length: {len(payload)}", f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    if payload:
+        headers.append("Content-Type: application/json")
+    return ("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + payload
+
+
+class Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class HttpPool:
+    """Bounded pool of keep-alive connections to one `http://host:port` target."""
+
+    def __init__(self, base_url: str, size: int = 32, timeout: float = 5.0) -> None:
+        url = urlsplit(base_url)
+        if url.scheme != "http" or not url.hostname:
+            raise ValueError(f"unsupported target {base_url!r}; expected http://host:port")
+        self.host, self.port = url.hostname, url.port or 80
+        self.prefix = url.path.rstrip("/")
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(size)
+        self._idle: list[Connection] = []
+        self.opened = 0
+
+    async def _acquire(self) -> Connection:
+        await self._slots.acquire()
+        if self._idle:
+            return self._idle.pop()
+        try:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+        except BaseException:
+            self._slots.release()
+            raise
+        self.opened += 1
+        return Connection(reader, writer)
+
+    def _release(self, conn: Connection, reuse: bool) -> None:
+        if reuse:
+            self._idle.append(conn)
+        else:
+            conn.close()
+        self._slots.release()
+
+    async def request(self, method: str, path: str, body: Any = None) -> tuple[int, Any]:
+        """Send one request; return `(status, decoded JSON body or None)`.
+
+        Raises `asyncio.TimeoutError`, `OSError` or `HttpError` when no response arrives.
+        """
+        conn = await self._acquire()
+        reuse = False
+        try:
+            async with asyncio.timeout(self.timeout):
+                conn.writer.write(encode_message(f"{method} {self.prefix}{path} HTTP/1.1", body,
+                                                 host=f"{self.host}:{self.port}"))
+                start, headers, raw = await read_message(conn.reader)
+            status = int(start.split()[1])
+            reuse = headers.get("connection", "keep-alive").lower() != "close"
+            return status, json.loads(raw) if raw else None
+        except (asyncio.IncompleteReadError, IndexError, ValueError) as exc:
+            raise HttpError(str(exc) or type(exc).__name__) from exc
+        finally:
+            self._release(conn, reuse)
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+        await asyncio.gather(*(conn.writer.wait_closed() for conn in idle), return_exceptions=True)
@@ -0,0 +1,207 @@
+"""Shared helpers for the MoAI-ADK tooling scripts.
+
+Every script in `.moai/scripts/` is stdlib-only and imports its siblings by
+module name, so they can be run directly (`python3 .moai/scripts/<tool>.py`).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+TAG_KINDS = ("SPEC", "TEST", "CODE", "DOC")
+TAG_ROOTS = (".moai/specs", "tests", "src", "docs")
+SKIP_DIRS = frozenset({".git", "node_modules", "build", "target", ".gradle", "__pycache__", ".venv", "venv"})
+
+# @CODE:AUTH-001, @CODE:AUTH-001:API, @SPEC:UPDATE-REFACTOR-001
+TAG_PATTERN = re.compile(
+    r"@(SPEC|TEST|CODE|DOC):([A-Z][A-Z0-9]*(?:-[A-Z0-9]+)*-\d{3})(?::(API|UI|DATA|DOMAIN|INFRA))?"
+)
+# SPEC: SPEC-AUTH-001.md v0.1.0
+VERSION_REF_PATTERN = re.compile(r"SPEC-([A-Z][A-Z0-9]*(?:-[A-Z0-9]+)*-\d{3})\.md v(\d+\.\d+\.\d+)")
+
+
+def find_project_root(start: Path | None = None) -> Path:
+    """Return the nearest ancestor of `start` that contains `.moai/config.json`."""
+    current = (start or Path.cwd()).resolve()
+    for candidate in (current, *current.parents):
+        if (candidate / ".moai" / "config.json").is_file():
+            return candidate
+    raise FileNotFoundError(f"no .moai/config.json found above {current}")
+
+
+def cache_dir(root: Path) -> Path:
+    """Return `.moai/cache/`, creating it on first use."""
+    path = root / ".moai" / "cache"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def iter_source_files(root: Path, roots: tuple[str, ...] = TAG_ROOTS) -> Iterator[Path]:
+    """Yield every regular file under the TAG roots, skipping VCS/build output."""
+    for rel in roots:
+        base = root / rel
+        if not base.is_dir():
+            continue
+        for dirpath, dirnames, filenames in os.walk(base):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+            for name in filenames:
+                yield Path(dirpath, name)
+
+
+def relpath(root: Path, path: Path) -> str:
+    """Return `path` relative to `root` using forward slashes."""
+    path = root / path
+    try:
+        return path.relative_to(root).as_posix()
+    except ValueError:
+        return path.resolve().relative_to(root).as_posix()
+
+
+def scan_tags(text: str) -> Iterator[tuple[int, str, str, str | None]]:
+    """Yield `(line, kind, tag_id, subcategory)` for every @TAG in `text`."""
+    for lineno, line in enumerate(text.splitlines(), start=1):
+        if "@" not in line:
+            continue
+        for match in TAG_PATTERN.finditer(line):
+            yield lineno, match.group(1), match.group(2), match.group(3)
+
+
+def scan_version_refs(text: str) -> Iterator[tuple[int, str, str]]:
+    """Yield `(line, spec_id, version)` for every `SPEC-{ID}.md vX.Y.Z` reference."""
+    for lineno, line in enumerate(text.splitlines(), start=1):
+        if ".md v" not in line:
+            continue
+        for match in VERSION_REF_PATTERN.finditer(line):
+            yield lineno, match.group(1), match.group(2)
+
+
+SPEC_GLOB = ".moai/specs/SPEC-*/spec.md"
+HISTORY_ENTRY = re.compile(r"^###\s+v(\d+\.\d+\.\d+)(?:\s*\((\d{4}-\d{2}-\d{2})\))?")
+
+
+@dataclass
+class SpecHeader:
+    """Front matter and HISTORY version headers of a SPEC document."""
+
+    front_matter: dict[str, Any] = field(default_factory=dict)
+    has_front_matter: bool = False
+    has_history: bool = False
+    history: list[tuple[str, str | None, int]] = field(default_factory=list)
+    history_lines: list[str] = field(default_factory=list)
+
+
+def read_spec_header(lines: Iterable[str]) -> SpecHeader:
+    """Parse the YAML front matter and `## HISTORY` headers, stopping right after them.
+
+    Reading stops at the first H2 that is not HISTORY, or where the HISTORY
+    section ends, so the body of the SPEC is never consumed.
+    """
+    header = SpecHeader()
+    it = iter(enumerate(lines, start=1))
+    first = next(it, None)
+    if first and first[1].strip() == "---":
+        block = []
+        for _, line in it:
+            if line.strip() == "---":
+                header.has_front_matter = True
+                break
+            block.append(line.rstrip("\n"))
+        header.front_matter = parse_yaml_block(block)
+    in_history = False
+    for lineno, line in it:
+        if line.startswith("## "):
+            if in_history or line[3:].strip() != "HISTORY":
+                break
+            in_history = header.has_history = True
+        elif in_history and line.startswith("---"):
+            break
+        elif in_history:
+            header.history_lines.append(line.rstrip("\n"))
+            if match := HISTORY_ENTRY.match(line):
+                header.history.append((match.group(1), match.group(2), lineno))
+    return header
+
+
+def load_spec_header(path: Path) -> SpecHeader:
+    with open(path, encoding="utf-8", errors="replace") as handle:
+        return read_spec_header(handle)
+
+
+def parse_yaml_block(lines: list[str]) -> dict[str, Any]:
+    """Parse the YAML subset used by SPEC front matter.
+
+    Supports nested mappings, block and inline (`[a, b]`) lists of scalars,
+    and values PyYAML would reject such as `author: @Goos`.
+    """
+    rows = []
+    for line in lines:
+        stripped = line.strip()
+        if stripped and not stripped.startswith("#"):
+            rows.append((len(line) - len(line.lstrip(" ")), stripped))
+    value, _ = _parse_node(rows, 0, 0)
+    return value if isinstance(value, dict) else {}
+
+
+def _parse_node(rows: list[tuple[int, str]], i: int, indent: int) -> tuple[Any, int]:
+    if i < len(rows) and rows[i][1].startswith("- "):
+        items = []
+        while i < len(rows) and rows[i][0] == indent and rows[i][1].startswith("- "):
+            items.append(_scalar(rows[i][1][2:]))
+            i += 1
+        return items, i
+    mapping: dict[str, Any] = {}
+    while i < len(rows) and rows[i][0] == indent:
+        key, _, rest = rows[i][1].partition(":")
+        i += 1
+        rest = rest.strip()
+        if rest and not rest.startswith("#"):
+            mapping[key.strip()] = _scalar(rest)
+        elif i < len(rows) and (rows[i][0] > indent or rows[i][1].startswith("- ")):
+            mapping[key.strip()], i = _parse_node(rows, i, rows[i][0])
+        else:
+            mapping[key.strip()] = None
+    return mapping, i
+
+
+def _scalar(raw: str) -> Any:
+    raw = raw.strip()
+    if raw[:1] in ("'", '"'):
+        end = raw.find(raw[0], 1)
+        return raw[1:end] if end > 0 else raw[1:]
+    raw = raw.split(" #", 1)[0].strip()
+    if raw.startswith("[") and raw.endswith("]"):
+        return [_scalar(part) for part in raw[1:-1].split(",") if part.strip()]
+    return raw
+
+
+# Marker files checked in the same order as the CI toolchain setup steps.
+LANGUAGE_MARKERS = (
+    ("python", ("pyproject.toml", "setup.py", "requirements.txt")),
+    ("typescript", ("package.json",)),
+    ("go", ("go.mod",)),
+    ("rust", ("Cargo.toml",)),
+    ("java", ("pom.xml", "build.gradle", "build.gradle.kts")),
+    ("ruby", ("Gemfile",)),
+    ("dart", ("pubspec.yaml",)),
+    ("swift", ("Package.swift",)),
+)
+
+
+def detect_language(root: Path) -> str | None:
+    """Return the project language from `.moai/config.json`, else from marker files."""
+    try:
+        config = json.loads((root / ".moai" / "config.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        config = {}
+    language = config.get("language") or config.get("language_detection", {}).get("detected_language")
+    if language:
+        return str(language).lower()
+    for name, markers in LANGUAGE_MARKERS:
+        if any((root / marker).is_file() for marker in markers):
+            return name
+    return None
@@ -0,0 +1,262 @@
+"""Advisory pre-push hook: GitFlow, SPEC metadata and TAG checks on pushed commits only.
+
+Git passes `<remote> <url>` as arguments and one `<local ref> <local sha>
+<remote ref> <remote sha>` line per pushed ref on stdin. Only the commits in
+those ranges are inspected (`git diff-tree` for the changed paths,
+`git cat-file --batch` for their contents). `.moai/cache/pre-push.json`
+remembers each commit's changed `(path, blob)` pairs and each pair's verdict.
+Because the checks depend only on path and content, a re-pushed commit costs
+nothing, and a rebased commit, which gets a new SHA but keeps its blobs, costs
+one `diff-tree` line. Work stops at the latency budget (`MOAI_PREPUSH_BUDGET`,
+seconds) and whatever is unchecked is reported.
+
+The hook is advisory (see gitflow-protection-policy.md): it always exits 0.
+
+Usage:
+    python3 .moai/scripts/pre_push.py --install
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path, PurePosixPath
+
+from moai_core import cache_dir, find_project_root, read_spec_header, scan_tags
+from spec_validator import check_spec
+
+ZERO_SHA = re.compile(r"^0+$")
+# feature/SPEC-AUTH-001, feature/SPEC-001-new-feature (see gitflow-protection-policy.md)
+FEATURE_BRANCH = re.compile(r"^feature/SPEC-(?:[A-Z][A-Z0-9]*-)*\d{3,}(?:-[A-Za-z0-9][A-Za-z0-9._-]*)?$")
+KNOWN_BRANCHES = re.compile(r"^(main|develop|feature/.+|hotfix/.+|release/.+)$")
+TAGGED_ROOTS = ("src/", "tests/", "docs/")
+DEFAULT_BUDGET_S = 2.0
+CACHE_VERSION = 2
+MAX_CACHE_ENTRIES = 5000
+HOOK_MARKER = "MoAI-ADK advisory pre-push hook"
+HOOK_SCRIPT = f"""#!/bin/sh
+# {HOOK_MARKER} (see .moai/memory/gitflow-protection-policy.md)
+# Advisory only: a missing script or interpreter, or any failure, never blocks the push.
+hook="$(git rev-parse --show-toplevel)/.moai/scripts/pre_push.py"
+[ -f "$hook" ] && command -v python3 >/dev/null 2>&1 || exit 0
+python3 "$hook" "$@" || exit 0
+"""
+GITFLOW_ADVICE = """⚠️  ADVISORY: Non-standard GitFlow detected
+
+Current branch: {branch}
+Target branch: main
+
+Recommended GitFlow workflow:
+  1. Work on feature/SPEC-{{ID}} branch (created from develop)
+  2. Push to feature/SPEC-{{ID}} and create PR to develop
+  3. Merge into develop after code review
+  4. When develop is stable, create PR from develop to main
+  5. Release manager merges develop -> main with tag
+"""
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+class Git:
+    """Thin git runner that enforces the hook's deadline on every call."""
+
+    def __init__(self, root: Path, deadline: float) -> None:
+        self.root = root
+        self.deadline = deadline
+
+    def run(self, *args: str, stdin: bytes | None = None, check: bool = True) -> subprocess.CompletedProcess[bytes]:
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            raise BudgetExceeded
+        try:
+            return subprocess.run(["git", "-c", "core.quotePath=false", *args], cwd=self.root, input=stdin,
+                                  capture_output=True, timeout=remaining, check=check)
+        except subprocess.TimeoutExpired as exc:
+            raise BudgetExceeded from exc
+
+    def text(self, *args: str) -> str:
+        return self.run(*args).stdout.decode("utf-8", errors="replace")
+
+
+def branch_advisories(git: Git, local_ref: str, local_sha: str, remote_ref: str, remote_sha: str) -> list[str]:
+    branch = local_ref.removeprefix("refs/heads/")
+    if branch == "HEAD":
+        branch = git.text("rev-parse", "--abbrev-ref", "HEAD").strip()
+    target = remote_ref.removeprefix("refs/heads/")
+    notes = []
+    if ZERO_SHA.match(local_sha):
+        return [f"⚠️  ADVISORY: deleting remote branch {target}"] if target in ("main", "develop") else []
+    if target == "main" and branch != "develop":
+        notes.append(GITFLOW_ADVICE.format(branch=branch))
+    if target.startswith("feature/") and not FEATURE_BRANCH.match(target):
+        notes.append(f"⚠️  ADVISORY: feature branch `{target}` should be named feature/SPEC-{{ID}}[-description]")
+    elif not KNOWN_BRANCHES.match(target):
+        notes.append(f"⚠️  ADVISORY: `{target}` is not a GitFlow branch (feature/SPEC-{{ID}}, develop, main)")
+    if not ZERO_SHA.match(remote_sha):
+        exists = git.run("cat-file", "-e", f"{remote_sha}^{{commit}}", check=False).returncode == 0
+        if exists and git.run("merge-base", "--is-ancestor", remote_sha, local_sha, check=False).returncode != 0:
+            notes.append(f"⚠️  ADVISORY: Force-push to {target} detected — prefer a reviewed PR")
+    return notes
+
+
+def pushed_commits(git: Git, remote: str, local_sha: str, remote_sha: str) -> list[str]:
+    known = not ZERO_SHA.match(remote_sha) and git.run("cat-file", "-e", remote_sha, check=False).returncode == 0
+    exclude = [f"^{remote_sha}"] if known else ["--not", f"--remotes={remote}"]
+    return git.text("rev-list", "--reverse", local_sha, *exclude).split()
+
+
+def changed_blobs(git: Git, commits: list[str]) -> dict[str, list[tuple[str, str]]]:
+    """Return `{commit: [(path, blob_sha), ...]}` for added/modified files worth checking."""
+    out = git.run("diff-tree", "--stdin", "-r", "--root", "--no-renames", "--diff-filter=AM",
+                  stdin="\n".join(commits).encode() + b"\n").stdout.decode("utf-8", errors="replace")
+    blobs: dict[str, list[tuple[str, str]]] = {sha: [] for sha in commits}
+    current = None
+    for line in out.splitlines():
+        if not line.startswith(":"):
+            current = line.strip() or current
+            continue
+        meta, _, path = line.partition("\t")
+        blob_sha = meta.split()[3]
+        if current and (path.endswith("/spec.md") and path.startswith(".moai/specs/") or path.startswith(TAGGED_ROOTS)):
+            blobs[current].append((path, blob_sha))
+    return blobs
+
+
+def read_blobs(git: Git, shas: set[str]) -> dict[str, str]:
+    """Fetch blob contents with a single `git cat-file --batch` process."""
+    if not shas:
+        return {}
+    data = git.run("cat-file", "--batch", stdin="\n".join(sorted(shas)).encode() + b"\n").stdout
+    contents, offset = {}, 0
+    while offset < len(data):
+        header_end = data.index(b"\n", offset)
+        sha, kind, *rest = data[offset:header_end].decode().split()
+        offset = header_end + 1
+        if kind == "missing":
+            continue
+        size = int(rest[0])
+        contents[sha] = data[offset:offset + size].decode("utf-8", errors="replace")
+        offset += size + 1
+    return contents
+
+
+def file_verdict(path: str, text: str) -> dict[str, list[str]]:
+    """Check one file version: SPEC metadata for spec.md, otherwise the TEST/CODE TAG IDs it carries."""
+    if path.endswith("/spec.md"):
+        errors, _ = check_spec(read_spec_header(text.splitlines(keepends=True)), PurePosixPath(path).parent.name)
+        return {"warnings": [f"{path}: {error}" for error in errors], "tags": []}
+    tags = {f"{kind}:{tag_id}" for _, kind, tag_id, _ in scan_tags(text) if kind in ("TEST", "CODE")}
+    return {"warnings": [], "tags": sorted(tags)}
+
+
+def blob_key(path: str, blob_sha: str) -> str:
+    return f"{blob_sha}:{path}"
+
+
+def load_cache(path: Path) -> dict[str, dict]:
+    """Return `{"commits": {sha: [[path, blob], ...]}, "blobs": {blob_key: verdict}}`."""
+    try:
+        cache = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        cache = None
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        return {"commits": {}, "blobs": {}}
+    return {"commits": cache.get("commits", {}), "blobs": cache.get("blobs", {})}
+
+
+def save_cache(path: Path, cache: dict[str, dict]) -> None:
+    trimmed = {name: dict(list(entries.items())[-MAX_CACHE_ENTRIES:]) for name, entries in cache.items()}
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"version": CACHE_VERSION, **trimmed}), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def check_push(git: Git, remote: str, updates: list[list[str]], cache: dict, notes: list[str]) -> None:
+    """Append advisories for the pushed ref updates to `notes`; may raise BudgetExceeded."""
+    for local_ref, local_sha, remote_ref, remote_sha in updates:
+        notes += branch_advisories(git, local_ref, local_sha, remote_ref, remote_sha)
+        if ZERO_SHA.match(local_sha):
+            continue
+        commits = pushed_commits(git, remote, local_sha, remote_sha)
+        todo = [sha for sha in commits if sha not in cache["commits"]]
+        if todo:
+            for sha, files in changed_blobs(git, todo).items():
+                cache["commits"][sha] = [list(pair) for pair in files]
+        unchecked = {(path, blob) for sha in commits for path, blob in cache["commits"][sha]
+                     if blob_key(path, blob) not in cache["blobs"]}
+        contents = read_blobs(git, {blob for _, blob in unchecked})
+        for path, blob in unchecked:
+            cache["blobs"][blob_key(path, blob)] = file_verdict(path, contents.get(blob, ""))
+        listing = git.text("ls-tree", "--name-only", local_sha, ".moai/specs/").splitlines()
+        specs = {PurePosixPath(path).name.removeprefix("SPEC-") for path in listing}
+        for sha in commits:
+            verdicts = [cache["blobs"][blob_key(path, blob)] for path, blob in cache["commits"][sha]]
+            notes += [f"⚠️  {sha[:8]} {w}" for verdict in verdicts for w in verdict["warnings"]]
+            tags = {t for verdict in verdicts for t in verdict["tags"]}
+            orphans = sorted(t for t in tags if t.split(":", 1)[1] not in specs)
+            notes += [f"⚠️  {sha[:8]} @{t} has no SPEC-{t.split(':', 1)[1]}" for t in orphans]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("remote", nargs="?", default="origin")
+    parser.add_argument("url", nargs="?")
+    parser.add_argument("--install", action="store_true", help="install as .git/hooks/pre-push")
+    parser.add_argument("--force", action="store_true", help="with --install, replace an existing hook")
+    args = parser.parse_args(argv)
+
+    if args.install:
+        return install(find_project_root(), args.force)
+    try:
+        run_hook(args.remote)
+    except Exception as exc:  # advisory hook: report, never block the push
+        print(f"⚠️  pre-push checks skipped: {type(exc).__name__}: {exc}", file=sys.stderr)
+    return 0
+
+
+def run_hook(remote: str) -> None:
+    root = find_project_root()
+    budget = float(os.environ.get("MOAI_PREPUSH_BUDGET", DEFAULT_BUDGET_S))
+    git = Git(root, time.monotonic() + budget)
+    updates = [line.split() for line in sys.stdin if len(line.split()) == 4]
+    cache_file = cache_dir(root) / "pre-push.json"
+    cache = load_cache(cache_file)
+    notes: list[str] = []
+    try:
+        check_push(git, remote, updates, cache, notes)
+    except BudgetExceeded:
+        notes.append(f"⏱️  pre-push checks stopped at the {budget:g}s budget; unchecked commits run next push")
+    except subprocess.CalledProcessError as exc:
+        notes.append(f"⚠️  pre-push checks skipped: {exc.stderr.decode(errors='replace').strip()}")
+    except Exception as exc:  # keep the advisories gathered so far
+        notes.append(f"⚠️  pre-push checks stopped: {type(exc).__name__}: {exc}")
+    save_cache(cache_file, cache)
+    for note in notes:
+        print(note, file=sys.stderr)
+    if notes:
+        print("✓ Push will proceed (flexibility mode enabled)", file=sys.stderr)
+
+
+def install(root: Path, force: bool) -> int:
+    hook = Path(subprocess.run(["git", "rev-parse", "--git-path", "hooks/pre-push"], cwd=root,
+                               capture_output=True, text=True, check=True).stdout.strip())
+    hook = hook if hook.is_absolute() else root / hook
+    if hook.exists() and HOOK_MARKER not in hook.read_text(encoding="utf-8", errors="replace") and not force:
+        print(f"{hook} exists and is not the MoAI hook; rerun with --force to replace it", file=sys.stderr)
+        return 1
+    hook.parent.mkdir(parents=True, exist_ok=True)
+    hook.write_text(HOOK_SCRIPT, encoding="utf-8")
+    hook.chmod(0o755)
+    print(f"installed {hook}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
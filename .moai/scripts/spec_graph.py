@@ -0,0 +1,274 @@
+"""SPEC dependency graph: cycle detection, impact queries and build order.
+
+The graph is built from the front matter of every SPEC (`depends_on`,
+`blocks`, `related_specs`, `scope.packages`, `scope.files`) and cached in
+`.moai/cache/spec-graph.json`. Only SPECs whose mtime/size changed are
+re-parsed on the next run.
+
+Edges point from a SPEC to the SPECs that must come after it: `X depends_on Y`
+gives `Y → X`, and `X blocks Z` gives `X → Z`. `related_specs` is kept for
+reference but never orders anything.
+
+Usage:
+    python3 .moai/scripts/spec_graph.py cycles
+    python3 .moai/scripts/spec_graph.py order
+    python3 .moai/scripts/spec_graph.py impact src/order [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import heapq
+import json
+import os
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+from moai_core import SPEC_GLOB, cache_dir, find_project_root, load_spec_header, relpath
+
+CACHE_VERSION = 1
+
+
+@dataclass
+class SpecNode:
+    id: str
+    path: str
+    depends_on: list[str] = field(default_factory=list)
+    blocks: list[str] = field(default_factory=list)
+    related_specs: list[str] = field(default_factory=list)
+    packages: list[str] = field(default_factory=list)
+    files: list[str] = field(default_factory=list)
+
+
+class CycleError(ValueError):
+    def __init__(self, cycles: list[list[str]]) -> None:
+        super().__init__("cyclic SPEC dependencies: " + "; ".join(", ".join(c) for c in cycles))
+        self.cycles = cycles
+
+
+def _as_list(value: Any) -> list[str]:
+    if isinstance(value, list):
+        return [str(v) for v in value]
+    return [str(value)] if value else []
+
+
+def node_from_header(rel: str, meta: dict[str, Any]) -> SpecNode:
+    scope = meta.get("scope") if isinstance(meta.get("scope"), dict) else {}
+    return SpecNode(
+        id=str(meta.get("id") or Path(rel).parent.name.removeprefix("SPEC-")),
+        path=rel,
+        depends_on=_as_list(meta.get("depends_on")),
+        blocks=_as_list(meta.get("blocks")),
+        related_specs=_as_list(meta.get("related_specs")),
+        packages=[p.rstrip("/") for p in _as_list(scope.get("packages"))],
+        files=_as_list(scope.get("files")),
+    )
+
+
+class SpecGraph:
+    def __init__(self, nodes: Iterable[SpecNode]) -> None:
+        self.nodes = {node.id: node for node in nodes}
+        self.successors: dict[str, set[str]] = {spec_id: set() for spec_id in self.nodes}
+        for node in self.nodes.values():
+            for dep in node.depends_on:
+                self.successors.setdefault(dep, set()).add(node.id)
+            self.successors[node.id].update(node.blocks)
+            for blocked in node.blocks:
+                self.successors.setdefault(blocked, set())
+        self._by_package: dict[str, set[str]] = {}
+        self._by_file: dict[str, set[str]] = {}
+        for node in self.nodes.values():
+            self._by_package.setdefault(str(Path(node.path).parent), set()).add(node.id)
+            for pkg in node.packages:
+                self._by_package.setdefault(pkg, set()).add(node.id)
+            for name in node.files:
+                self._by_file.setdefault(Path(name).name, set()).add(node.id)
+        self._packages = sorted(self._by_package)
+
+    def dangling(self) -> dict[str, list[str]]:
+        """Return references to SPEC IDs that do not exist, per referring SPEC."""
+        missing = {}
+        for node in self.nodes.values():
+            refs = [r for r in (*node.depends_on, *node.blocks, *node.related_specs) if r not in self.nodes]
+            if refs:
+                missing[node.id] = refs
+        return missing
+
+    def cycles(self) -> list[list[str]]:
+        """Return every dependency cycle (Tarjan's SCC algorithm, O(V + E))."""
+        index: dict[str, int] = {}
+        low: dict[str, int] = {}
+        stack: list[str] = []
+        on_stack: set[str] = set()
+        found = []
+        for start in sorted(self.successors):
+            if start in index:
+                continue
+            work = [(start, iter(sorted(self.successors[start])))]
+            index[start] = low[start] = len(index)
+            stack.append(start)
+            on_stack.add(start)
+            while work:
+                node, children = work[-1]
+                child = next(children, None)
+                if child is None:
+                    work.pop()
+                    if work:
+                        low[work[-1][0]] = min(low[work[-1][0]], low[node])
+                    if low[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        if len(component) > 1 or node in self.successors[node]:
+                            found.append(sorted(component))
+                elif child not in index:
+                    index[child] = low[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(sorted(self.successors[child]))))
+                elif child in on_stack:
+                    low[node] = min(low[node], index[child])
+        return sorted(found)
+
+    def topological_order(self) -> list[str]:
+        """Return a deterministic build order (Kahn's algorithm); raises CycleError."""
+        indegree = {spec_id: 0 for spec_id in self.successors}
+        for targets in self.successors.values():
+            for target in targets:
+                indegree[target] += 1
+        ready = [spec_id for spec_id, degree in indegree.items() if degree == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            spec_id = heapq.heappop(ready)
+            order.append(spec_id)
+            for target in self.successors[spec_id]:
+                indegree[target] -= 1
+                if indegree[target] == 0:
+                    heapq.heappush(ready, target)
+        if len(order) != len(indegree):
+            raise CycleError(self.cycles())
+        return order
+
+    def specs_for_paths(self, paths: Iterable[str]) -> set[str]:
+        """Return the SPECs whose scope (or own directory) covers any of `paths`.
+
+        A package matches when it contains the path (file queries) or lies under it (directory queries).
+        """
+        hits: set[str] = set()
+        for path in paths:
+            hits |= self._by_file.get(Path(path).name, set())
+            prefix = Path(path)
+            for package in self._packages_under(prefix.as_posix()):
+                hits |= self._by_package[package]
+            while str(prefix) not in ("", "."):
+                hits |= self._by_package.get(prefix.as_posix(), set())
+                prefix = prefix.parent
+        return hits & self.nodes.keys()
+
+    def _packages_under(self, directory: str) -> Iterable[str]:
+        if directory in ("", "."):
+            yield from self._packages
+            return
+        prefix = directory + "/"
+        for package in self._packages[bisect.bisect_left(self._packages, prefix):]:
+            if not package.startswith(prefix):
+                break
+            yield package
+
+    def downstream(self, spec_ids: Iterable[str]) -> set[str]:
+        """Return `spec_ids` plus every SPEC that transitively comes after them."""
+        seen = set(spec_ids)
+        frontier = list(seen)
+        while frontier:
+            for target in self.successors.get(frontier.pop(), ()):
+                if target not in seen:
+                    seen.add(target)
+                    frontier.append(target)
+        return seen
+
+    def impact(self, paths: Iterable[str]) -> set[str]:
+        return self.downstream(self.specs_for_paths(paths))
+
+
+def load_graph(root: Path) -> SpecGraph:
+    """Build the graph, reusing cached nodes for SPECs whose stat is unchanged."""
+    cache_file = cache_dir(root) / "spec-graph.json"
+    try:
+        cached = json.loads(cache_file.read_text(encoding="utf-8"))
+        if cached.get("version") != CACHE_VERSION:
+            cached = {}
+    except (OSError, ValueError):
+        cached = {}
+    entries = cached.get("entries", {})
+    fresh: dict[str, Any] = {}
+    for path in sorted(root.glob(SPEC_GLOB)):
+        rel = relpath(root, path)
+        st = os.stat(path)
+        stamp = [st.st_mtime_ns, st.st_size]
+        entry = entries.get(rel)
+        if not entry or entry["stamp"] != stamp:
+            entry = {"stamp": stamp, "node": asdict(node_from_header(rel, load_spec_header(path).front_matter))}
+        fresh[rel] = entry
+    if fresh != entries:
+        cache_file.write_text(json.dumps({"version": CACHE_VERSION, "entries": fresh}), encoding="utf-8")
+    return SpecGraph(SpecNode(**entry["node"]) for entry in fresh.values())
+
+
+def affected_tests(root: Path, spec_ids: Iterable[str]) -> set[str]:
+    """Return test files carrying `@TEST:<id>` for the given SPECs (via the TAG index)."""
+    from tag_index import TagIndex
+
+    with TagIndex(root) as index:
+        index.refresh()
+        return index.files_for(spec_ids, "TEST")
+
+
+def main(argv: list[str] | None = None) -> int:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--json", action="store_true")
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("cycles", parents=[common], help="list dependency cycles")
+    sub.add_parser("dangling", parents=[common], help="list references to unknown SPECs")
+    sub.add_parser("order", parents=[common], help="print a topological build order")
+    impact = sub.add_parser("impact", parents=[common], help="SPECs and tests affected by changed paths")
+    impact.add_argument("paths", nargs="+")
+    args = parser.parse_args(argv)
+
+    root = find_project_root()
+    graph = load_graph(root)
+    if args.command == "cycles":
+        result: Any = graph.cycles()
+    elif args.command == "dangling":
+        result = graph.dangling()
+    elif args.command == "order":
+        try:
+            result = graph.topological_order()
+        except CycleError as exc:
+            print(exc, file=sys.stderr)
+            return 1
+    else:
+        specs = graph.impact(p.rstrip("/") for p in args.paths)
+        result = {"specs": sorted(specs), "tests": sorted(affected_tests(root, specs))}
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False))
+    elif isinstance(result, dict) and args.command == "impact":
+        print("\n".join([*(f"SPEC-{s}" for s in result["specs"]), *result["tests"]]))
+    elif isinstance(result, dict):
+        print("\n".join(f"{spec}: {', '.join(refs)}" for spec, refs in result.items()))
+    else:
+        print("\n".join(", ".join(item) if isinstance(item, list) else item for item in result))
+    return 1 if args.command in ("cycles", "dangling") and result else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
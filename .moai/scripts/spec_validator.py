@@ -0,0 +1,184 @@
+"""Streaming SPEC front-matter validator.
+
+Implements the checks of `.moai/memory/spec-metadata.md` in a single pass per
+file: only the YAML front matter and the `## HISTORY` headers are read. Files
+are spread across a process pool and one JSON object per SPEC is written to
+stdout as soon as it is validated.
+
+Usage:
+    python3 .moai/scripts/spec_validator.py [PATH ...]
+    python3 .moai/scripts/spec_validator.py --changed-since origin/develop
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import os
+import re
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from moai_core import SPEC_GLOB, SpecHeader, find_project_root, load_spec_header, relpath
+
+REQUIRED_FIELDS = ("id", "version", "status", "created", "updated", "author", "priority")
+STATUS_VALUES = frozenset({"draft", "active", "completed", "deprecated"})
+PRIORITY_VALUES = frozenset({"low", "medium", "high", "critical"})
+CATEGORY_VALUES = frozenset({"feature", "bugfix", "refactor", "security", "docs", "perf"})
+RELATION_FIELDS = ("depends_on", "blocks", "related_specs")
+
+ID_FORMAT = re.compile(r"^[A-Z][A-Z0-9]*(?:-[A-Z0-9]+)*-\d{3}$")
+VERSION_FORMAT = re.compile(r"^(\d+)\.(\d+)\.(\d+)$")
+AUTHOR_FORMAT = re.compile(r"^@[A-Za-z0-9][A-Za-z0-9-]*$")
+SERIAL_THRESHOLD = 32
+
+
+def check_spec(header: SpecHeader, spec_dir: str | None = None) -> tuple[list[str], list[str]]:
+    """Return `(errors, warnings)` for a parsed SPEC header."""
+    errors: list[str] = []
+    warnings: list[str] = []
+    if not header.has_front_matter:
+        return ["missing YAML front matter"], warnings
+    meta = header.front_matter
+    errors += [f"missing required field: {name}" for name in REQUIRED_FIELDS if not meta.get(name)]
+    if "authors" in meta:
+        errors.append("legacy `authors` field; use a single `author: @Handle`")
+    errors += _check_formats(meta, spec_dir)
+    warnings += _check_optional(meta)
+    errors += _check_history(header, warnings)
+    version = VERSION_FORMAT.match(str(meta.get("version", "")))
+    if version and int(version.group(1)) >= 1:
+        warnings.append("version >= 1.0.0 requires explicit stakeholder approval")
+    return errors, warnings
+
+
+def _check_formats(meta: dict[str, Any], spec_dir: str | None) -> list[str]:
+    errors = []
+    spec_id = meta.get("id")
+    if spec_id and not ID_FORMAT.match(str(spec_id)):
+        errors.append(f"id `{spec_id}` is not <DOMAIN>-<3 digits>")
+    if spec_id and spec_dir and spec_dir != f"SPEC-{spec_id}":
+        errors.append(f"directory `{spec_dir}` does not match id (expected SPEC-{spec_id})")
+    if meta.get("version") and not VERSION_FORMAT.match(str(meta["version"])):
+        errors.append(f"version `{meta['version']}` is not MAJOR.MINOR.PATCH")
+    if meta.get("author") and not AUTHOR_FORMAT.match(str(meta["author"])):
+        errors.append(f"author `{meta['author']}` must be a single @GitHubHandle")
+    if meta.get("status") and meta["status"] not in STATUS_VALUES:
+        errors.append(f"status `{meta['status']}` not in {sorted(STATUS_VALUES)}")
+    if meta.get("priority") and meta["priority"] not in PRIORITY_VALUES:
+        errors.append(f"priority `{meta['priority']}` not in {sorted(PRIORITY_VALUES)}")
+    dates = {name: _parse_date(meta.get(name)) for name in ("created", "updated")}
+    errors += [f"{name} `{meta[name]}` is not YYYY-MM-DD" for name, value in dates.items() if meta.get(name) and not value]
+    if dates["created"] and dates["updated"] and dates["updated"] < dates["created"]:
+        errors.append("updated is earlier than created")
+    return errors
+
+
+def _check_optional(meta: dict[str, Any]) -> list[str]:
+    warnings = []
+    if meta.get("category") and meta["category"] not in CATEGORY_VALUES:
+        warnings.append(f"category `{meta['category']}` not in {sorted(CATEGORY_VALUES)}")
+    for name in RELATION_FIELDS:
+        value = meta.get(name)
+        if value is None:
+            continue
+        if not isinstance(value, list):
+            warnings.append(f"{name} should be a list of SPEC IDs")
+            continue
+        warnings += [f"{name} entry `{ref}` is not a SPEC ID" for ref in value if not ID_FORMAT.match(str(ref))]
+    return warnings
+
+
+def _check_history(header: SpecHeader, warnings: list[str]) -> list[str]:
+    if not header.has_history:
+        return ["missing ## HISTORY section"]
+    if not header.history:
+        return ["HISTORY has no `### vX.Y.Z` entries"]
+    latest = header.history[0][0]
+    if latest != str(header.front_matter.get("version")):
+        warnings.append(f"latest HISTORY entry v{latest} differs from version {header.front_matter.get('version')}")
+    return []
+
+
+def _parse_date(value: Any) -> dt.date | None:
+    try:
+        return dt.date.fromisoformat(str(value)) if value else None
+    except ValueError:
+        return None
+
+
+def validate_path(path: str, root: str) -> dict[str, Any]:
+    """Validate one spec.md; runs inside pool workers."""
+    spec = Path(path)
+    try:
+        header = load_spec_header(spec)
+    except OSError as exc:
+        return {"path": relpath(Path(root), spec), "ok": False, "errors": [str(exc)], "warnings": []}
+    errors, warnings = check_spec(header, spec.parent.name)
+    return {
+        "path": relpath(Path(root), spec),
+        "id": header.front_matter.get("id"),
+        "version": header.front_matter.get("version"),
+        "ok": not errors,
+        "errors": errors,
+        "warnings": warnings,
+    }
+
+
+def changed_specs(root: Path, ref: str) -> list[Path]:
+    """Return spec.md files that differ from `ref` (committed or not)."""
+    out = subprocess.run(
+        ["git", "diff", "--name-only", "--diff-filter=d", ref, "--", ".moai/specs"],
+        cwd=root, capture_output=True, text=True, check=True,
+    ).stdout
+    return sorted(root / line for line in out.splitlines() if line.endswith("/spec.md"))
+
+
+def validate_all(paths: Iterable[Path], root: Path, jobs: int | None = None) -> Iterator[dict[str, Any]]:
+    """Yield one result per SPEC, fanning out to a process pool for large sets."""
+    paths = [str(p) for p in paths]
+    roots = [str(root)] * len(paths)
+    if len(paths) < SERIAL_THRESHOLD or jobs == 1:
+        yield from map(validate_path, paths, roots)
+        return
+    workers = jobs or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(validate_path, paths, roots, chunksize=max(1, len(paths) // (workers * 8)))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", type=Path, help="spec.md files (default: every SPEC)")
+    parser.add_argument("--changed-since", metavar="GIT_REF", help="only SPECs changed since GIT_REF")
+    parser.add_argument("--jobs", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--errors-only", action="store_true", help="omit passing SPECs from the output")
+    args = parser.parse_args(argv)
+
+    root = find_project_root()
+    if args.paths:
+        paths = [p.resolve() for p in args.paths]
+    elif args.changed_since:
+        try:
+            paths = changed_specs(root, args.changed_since)
+        except subprocess.CalledProcessError as exc:
+            detail = exc.stderr.strip().splitlines()[0] if exc.stderr.strip() else f"git exited with {exc.returncode}"
+            parser.error(f"cannot diff against --changed-since {args.changed_since!r}: {detail}")
+    else:
+        paths = sorted(root.glob(SPEC_GLOB))
+
+    failed = 0
+    for result in validate_all(paths, root, args.jobs):
+        failed += not result["ok"]
+        if result["ok"] and args.errors_only:
+            continue
+        print(json.dumps(result, ensure_ascii=False), flush=True)
+    print(f"{len(paths)} SPEC(s) validated, {failed} with errors", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
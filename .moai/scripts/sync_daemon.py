@@ -0,0 +1,264 @@
+"""Watch-mode daemon that keeps the TAG chain and its status report up to date.
+
+Watches `.moai/specs/`, `src/`, `tests/` and `docs/` (inotify, or polling as a
+fallback), batches bursts of saves with a debounce window, refreshes only the
+touched files in the TAG index and rewrites `.moai/reports/tag-status.md`
+when its content changes. That file is the daemon's own; `sync-report.md`
+stays the output of `/alfred:3-sync`. Hooks and the CLI query the daemon over
+a Unix socket with one JSON request per connection instead of cold-starting a
+scan; it also hosts the context loader's document cache.
+
+Usage:
+    python3 .moai/scripts/sync_daemon.py start [--poll] [--debounce 0.25]
+    python3 .moai/scripts/sync_daemon.py status | broken | where @CODE:AUTH-001 | stop
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+from context_loader import ContextCache, load_context
+from fs_watch import RESCAN, PollingWatcher, make_watcher
+from moai_core import TAG_KINDS, TAG_ROOTS, cache_dir, find_project_root
+from tag_index import TagIndex, split_tag
+
+MAX_SOCKET_PATH = 100
+MAX_BATCH_DELAY = 2.0
+
+
+def socket_path(root: Path) -> Path:
+    """Return the daemon socket, moving it to the temp dir if the path is too long for AF_UNIX."""
+    path = cache_dir(root) / "sync.sock"
+    if len(os.fsencode(path)) <= MAX_SOCKET_PATH:
+        return path
+    digest = hashlib.blake2b(os.fsencode(root), digest_size=8).hexdigest()
+    return Path(tempfile.gettempdir(), f"moai-sync-{digest}.sock")
+
+
+def query(root: Path, request: dict[str, Any], timeout: float = 0.5) -> dict[str, Any] | None:
+    """Send one request to the daemon; return None when no daemon is running."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(os.fspath(socket_path(root)))
+            client.sendall(json.dumps(request).encode() + b"\n")
+            data = b"".join(iter(lambda: client.recv(65536), b""))
+        return json.loads(data)
+    except (OSError, ValueError):
+        return None
+
+
+class SyncState:
+    """TAG index plus derived chain state, shared between the watcher and socket threads."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.lock = threading.Lock()
+        self.index = TagIndex(root)
+        self.context = ContextCache()
+        self.report_path = root / ".moai" / "reports" / "tag-status.md"
+        self.batches = 0
+        self.last_batch: dict[str, Any] = {}
+        self.watcher = ""
+        self.watcher_error: str | None = None
+        self.apply({RESCAN})
+
+    def apply(self, changed: set[str]) -> None:
+        started = time.perf_counter()
+        with self.lock:
+            if RESCAN in changed:
+                stats = self.index.refresh()
+            else:
+                stats = self.index.refresh(Path(p) for p in sorted(changed))
+            self.batches += 1
+            self.last_batch = {**asdict(stats), "ms": round((time.perf_counter() - started) * 1000, 1)}
+            if stats.parsed or stats.removed or self.batches == 1:
+                self._write_report()
+
+    def _write_report(self) -> None:
+        counts = dict(self.index.conn.execute("SELECT kind, COUNT(*) FROM tags GROUP BY kind").fetchall())
+        files = self.index.conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        lines = [
+            "# TAG Status",
+            "",
+            f"- Files indexed: {files}",
+            *(f"- @{kind} TAGs: {counts.get(kind, 0)}" for kind in TAG_KINDS),
+            "",
+            "## Broken TAG Chains",
+            "",
+        ]
+        broken = self.index.broken_chains()
+        lines += [f"- {c.tag_id}: missing {', '.join('@' + k for k in c.missing)}" for c in broken] or ["- None"]
+        lines += ["", "## Duplicate SPEC IDs", ""]
+        duplicates = self.index.duplicate_specs()
+        lines += [f"- {tag_id}: {', '.join(paths)}" for tag_id, paths in duplicates.items()] or ["- None"]
+        body = "\n".join(lines) + "\n"
+        try:
+            previous = self.report_path.read_text(encoding="utf-8")
+        except OSError:
+            previous = ""
+        if previous.split("\n", 2)[-1] == body:
+            return
+        stamp = dt.datetime.now().astimezone().isoformat(timespec="seconds")
+        self.report_path.parent.mkdir(parents=True, exist_ok=True)
+        self.report_path.write_text(f"<!-- generated by sync_daemon.py at {stamp} -->\n\n{body}", encoding="utf-8")
+
+    def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        command = request.get("cmd")
+        with self.lock:
+            if command == "status":
+                return {"ok": True, "pid": os.getpid(), "batches": self.batches, "last_batch": self.last_batch,
+                        "watcher": self.watcher or "stopped", "watcher_error": self.watcher_error}
+            if command in ("broken", "where") and not self.watcher:
+                return {"ok": False, "error": f"file watcher stopped ({self.watcher_error}); the index may be stale"}
+            if command == "broken":
+                return {
+                    "ok": True,
+                    "broken": [asdict(c) for c in self.index.broken_chains()],
+                    "duplicates": self.index.duplicate_specs(),
+                }
+            if command == "where":
+                kind, tag_id = split_tag(str(request.get("tag", "")))
+                return {"ok": True, "locations": [asdict(loc) for loc in self.index.where(tag_id, kind)]}
+            if command == "context":
+                return self._context(request)
+        return {"ok": False, "error": f"unknown command: {command}"}
+
+    def _context(self, request: dict[str, Any]) -> dict[str, Any]:
+        try:
+            bundle = load_context(
+                self.root, self.context, str(request.get("command")), request.get("spec"),
+                request.get("sections"), bool(request.get("optional")),
+            )
+        except (KeyError, ValueError) as exc:
+            return {"ok": False, "error": str(exc)}
+        return {"ok": True, "bundle": bundle.to_dict()}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline() or b"{}")
+        except ValueError:
+            request = {}
+        if request.get("cmd") == "stop":
+            response = {"ok": True}
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        else:
+            response = self.server.state.handle(request)  # type: ignore[attr-defined]
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode() + b"\n")
+
+
+def serve(root: Path, debounce: float, force_polling: bool) -> int:
+    path = socket_path(root)
+    if query(root, {"cmd": "status"}) is not None:
+        print(f"sync daemon already running ({path})", file=sys.stderr)
+        return 1
+    path.unlink(missing_ok=True)
+    watcher = make_watcher(root, TAG_ROOTS, force_polling)
+    state = SyncState(root)
+    server = socketserver.ThreadingUnixStreamServer(os.fspath(path), _Handler)
+    server.daemon_threads = True
+    server.state = state  # type: ignore[attr-defined]
+    state.watcher = type(watcher).__name__
+    threading.Thread(target=_watch_loop, args=(watcher, state, debounce), daemon=True).start()
+    print(f"watching {', '.join(TAG_ROOTS)} with {type(watcher).__name__}; socket {path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        path.unlink(missing_ok=True)
+        watcher.close()
+    return 0
+
+
+def _watch_loop(watcher: Any, state: SyncState, debounce: float) -> None:
+    """Collect events and flush them once the tree has been quiet for `debounce` seconds.
+
+    A failing watcher (e.g. inotify hitting its watch limit on a new directory)
+    is replaced by a polling one and a full rescan is queued for the events it
+    may have missed. If polling fails too, the loop stops and the daemon
+    declines TAG queries so that clients rescan on their own.
+    """
+    pending: set[str] = set()
+    first = last = 0.0
+    while True:
+        timeout = None if not pending else max(0.0, min(last + debounce, first + MAX_BATCH_DELAY) - time.monotonic())
+        try:
+            events = watcher.poll(timeout)
+        except Exception as exc:
+            watcher = _replace_watcher(watcher, state, exc)
+            if watcher is None:
+                return
+            events = {RESCAN}
+        now = time.monotonic()
+        if events:
+            first = first if pending else now
+            last = now
+            pending |= events
+        if pending and (now - last >= debounce or now - first >= MAX_BATCH_DELAY):
+            batch, pending = pending, set()
+            try:
+                state.apply(batch)
+            except Exception as exc:  # a bad batch must not take the daemon down
+                print(f"sync batch failed: {exc}", file=sys.stderr)
+
+
+def _replace_watcher(watcher: Any, state: SyncState, exc: Exception) -> PollingWatcher | None:
+    """Swap a failed watcher for a polling one; return None (and mark the daemon stale) if none can run."""
+    error = f"{type(watcher).__name__}: {exc}"
+    print(f"file watcher failed: {error}", file=sys.stderr)
+    state.watcher_error = f"{state.watcher_error}; {error}" if state.watcher_error else error
+    watcher.close()
+    replacement = None
+    if not isinstance(watcher, PollingWatcher):
+        try:
+            replacement = PollingWatcher(state.root, TAG_ROOTS)
+        except Exception as poll_exc:
+            state.watcher_error += f"; PollingWatcher: {poll_exc}"
+    with state.lock:
+        state.watcher = type(replacement).__name__ if replacement else ""
+    return replacement
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    start = sub.add_parser("start", help="run the daemon in the foreground")
+    start.add_argument("--poll", action="store_true", help="force the polling watcher")
+    start.add_argument("--debounce", type=float, default=0.25, help="quiet period in seconds before a batch")
+    for name in ("status", "broken", "stop"):
+        sub.add_parser(name)
+    where = sub.add_parser("where")
+    where.add_argument("tag")
+    args = parser.parse_args(argv)
+
+    root = find_project_root()
+    if args.command == "start":
+        return serve(root, args.debounce, args.poll)
+    request = {"cmd": args.command, **({"tag": args.tag} if args.command == "where" else {})}
+    response = query(root, request, timeout=5.0)
+    if response is None:
+        print("sync daemon is not running", file=sys.stderr)
+        return 1
+    print(json.dumps(response, ensure_ascii=False, indent=2))
+    return 0 if response.get("ok") else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
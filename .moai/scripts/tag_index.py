@@ -0,0 +1,302 @@
+"""Persistent, incremental @TAG index backed by SQLite.
+
+The index lives in `.moai/cache/tag-index.sqlite3` and records, per file, the
+mtime/size/content hash it was parsed at, its TAGs and its `SPEC-{ID}.md vX.Y.Z`
+version references. A refresh only re-parses files whose stat changed *and*
+whose content hash differs, so "where is @CODE:AUTH-001" and "which chains are
+broken" are answered without walking the tree again.
+
+`where` and `broken` ask the sync daemon when it is running; otherwise they
+refresh the index first, which only re-reads files whose mtime or size
+changed. Pass `--no-refresh` to query the index as of its last refresh.
+
+Usage:
+    python3 .moai/scripts/tag_index.py refresh
+    python3 .moai/scripts/tag_index.py where @CODE:AUTH-001
+    python3 .moai/scripts/tag_index.py --no-refresh broken [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable
+
+from moai_core import (
+    TAG_KINDS,
+    cache_dir,
+    find_project_root,
+    iter_source_files,
+    relpath,
+    scan_tags,
+    scan_version_refs,
+)
+
+SCHEMA_VERSION = 2
+REQUIRED_KINDS = ("SPEC", "TEST", "CODE")
+BINARY_SNIFF_BYTES = 8192
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tags (
+    path TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    tag_id TEXT NOT NULL,
+    sub TEXT
+);
+CREATE TABLE IF NOT EXISTS version_refs (
+    path TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    spec_id TEXT NOT NULL,
+    version TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tags_by_id ON tags (tag_id, kind);
+CREATE INDEX IF NOT EXISTS tags_by_path ON tags (path);
+CREATE INDEX IF NOT EXISTS version_refs_by_path ON version_refs (path);
+"""
+
+
+@dataclass(frozen=True)
+class TagLocation:
+    kind: str
+    tag_id: str
+    path: str
+    line: int
+    sub: str | None = None
+
+
+@dataclass(frozen=True)
+class BrokenChain:
+    tag_id: str
+    present: tuple[str, ...]
+    missing: tuple[str, ...]
+
+
+@dataclass
+class RefreshStats:
+    scanned: int = 0
+    parsed: int = 0
+    removed: int = 0
+
+
+@dataclass(frozen=True)
+class VersionRef:
+    spec_id: str
+    version: str
+    path: str
+    line: int
+
+
+def file_digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def parse_blob(data: bytes) -> tuple[list[tuple[int, str, str, str | None]], list[tuple[int, str, str]]]:
+    """Extract TAGs and `SPEC-{ID}.md vX.Y.Z` references from raw file content; binary files yield nothing."""
+    if b"\0" in data[:BINARY_SNIFF_BYTES]:
+        return [], []
+    text = data.decode("utf-8", errors="replace")
+    return list(scan_tags(text)), list(scan_version_refs(text))
+
+
+class TagIndex:
+    """SQLite-backed TAG index keyed by file path, mtime and content hash."""
+
+    def __init__(self, root: Path, db_path: Path | None = None) -> None:
+        self.root = root
+        self.db_path = db_path or cache_dir(root) / "tag-index.sqlite3"
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._ensure_schema()
+
+    def _ensure_schema(self) -> None:
+        row = None
+        try:
+            row = self.conn.execute("SELECT value FROM meta WHERE key='schema'").fetchone()
+        except sqlite3.OperationalError:
+            pass
+        if row and row[0] != str(SCHEMA_VERSION):
+            self.conn.executescript(
+                "DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS tags; DROP TABLE IF EXISTS version_refs;"
+            )
+        self.conn.executescript(SCHEMA)
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema', ?)", (str(SCHEMA_VERSION),))
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> TagIndex:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def refresh(self, paths: Iterable[Path] | None = None) -> RefreshStats:
+        """Re-parse changed files; with `paths`, only those files are considered."""
+        known = {row[0]: row[1:] for row in self.conn.execute("SELECT path, mtime_ns, size, digest FROM files")}
+        full_scan = paths is None
+        candidates = iter_source_files(self.root) if full_scan else (self.root / p for p in paths)
+        stats = RefreshStats()
+        seen: set[str] = set()
+        with self.conn:
+            for path in candidates:
+                rel = relpath(self.root, path)
+                seen.add(rel)
+                stats.scanned += 1
+                if self._refresh_file(path, rel, known.get(rel)):
+                    stats.parsed += 1
+            gone = set(known) - seen if full_scan else {rel for rel in seen if not (self.root / rel).is_file()}
+            for rel in gone:
+                self._forget(rel)
+            stats.removed = len(gone)
+        return stats
+
+    def _refresh_file(self, path: Path, rel: str, known: tuple[int, int, str] | None) -> bool:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return False
+        if known and known[0] == st.st_mtime_ns and known[1] == st.st_size:
+            return False
+        data = path.read_bytes()
+        digest = file_digest(data)
+        self.conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)", (rel, st.st_mtime_ns, st.st_size, digest))
+        if known and known[2] == digest:
+            return False
+        self.conn.execute("DELETE FROM tags WHERE path = ?", (rel,))
+        self.conn.execute("DELETE FROM version_refs WHERE path = ?", (rel,))
+        tags, refs = parse_blob(data)
+        self.conn.executemany("INSERT INTO tags VALUES (?, ?, ?, ?, ?)", [(rel, *tag) for tag in tags])
+        self.conn.executemany("INSERT INTO version_refs VALUES (?, ?, ?, ?)", [(rel, *ref) for ref in refs])
+        return True
+
+    def _forget(self, rel: str) -> None:
+        self.conn.execute("DELETE FROM files WHERE path = ?", (rel,))
+        self.conn.execute("DELETE FROM tags WHERE path = ?", (rel,))
+        self.conn.execute("DELETE FROM version_refs WHERE path = ?", (rel,))
+
+    def is_empty(self) -> bool:
+        return self.conn.execute("SELECT 1 FROM files LIMIT 1").fetchone() is None
+
+    def where(self, tag_id: str, kind: str | None = None) -> list[TagLocation]:
+        """Return every location of `tag_id`, optionally limited to one TAG kind."""
+        sql = "SELECT kind, tag_id, path, line, sub FROM tags WHERE tag_id = ?"
+        params: tuple[str, ...] = (tag_id,)
+        if kind:
+            sql += " AND kind = ?"
+            params += (kind,)
+        rows = self.conn.execute(sql + " ORDER BY kind, path, line", params)
+        return [TagLocation(*row) for row in rows]
+
+    def tags_in(self, rel: str) -> list[TagLocation]:
+        rows = self.conn.execute("SELECT kind, tag_id, path, line, sub FROM tags WHERE path = ? ORDER BY line", (rel,))
+        return [TagLocation(*row) for row in rows]
+
+    def files_for(self, tag_ids: Iterable[str], kind: str) -> set[str]:
+        """Return the files carrying `@<kind>:<id>` for any of `tag_ids`."""
+        ids = sorted(set(tag_ids))
+        if not ids:
+            return set()
+        marks = ",".join("?" * len(ids))
+        rows = self.conn.execute(f"SELECT DISTINCT path FROM tags WHERE kind = ? AND tag_id IN ({marks})", (kind, *ids))
+        return {row[0] for row in rows}
+
+    def version_refs(self) -> list[VersionRef]:
+        """Return every `SPEC-{ID}.md vX.Y.Z` reference in the indexed tree."""
+        rows = self.conn.execute("SELECT spec_id, version, path, line FROM version_refs ORDER BY spec_id, path, line")
+        return [VersionRef(*row) for row in rows]
+
+    def broken_chains(self) -> list[BrokenChain]:
+        """Return IDs missing any of the SPEC → TEST → CODE links."""
+        rows = self.conn.execute("SELECT tag_id, GROUP_CONCAT(DISTINCT kind) FROM tags GROUP BY tag_id ORDER BY tag_id")
+        broken = []
+        for tag_id, kinds in rows:
+            present = tuple(k for k in TAG_KINDS if k in kinds.split(","))
+            missing = tuple(k for k in REQUIRED_KINDS if k not in present)
+            if missing:
+                broken.append(BrokenChain(tag_id, present, missing))
+        return broken
+
+    def duplicate_specs(self) -> dict[str, list[str]]:
+        """Return SPEC IDs defined in more than one file."""
+        rows = self.conn.execute(
+            "SELECT tag_id, GROUP_CONCAT(DISTINCT path) FROM tags WHERE kind = 'SPEC' "
+            "GROUP BY tag_id HAVING COUNT(DISTINCT path) > 1"
+        )
+        return {tag_id: sorted(paths.split(",")) for tag_id, paths in rows}
+
+
+def split_tag(value: str) -> tuple[str | None, str]:
+    """Accept `AUTH-001`, `CODE:AUTH-001` or `@CODE:AUTH-001`."""
+    kind, _, tag_id = value.lstrip("@").rpartition(":")
+    return (kind.upper() or None), tag_id
+
+
+def _daemon_query(root: Path, args: argparse.Namespace) -> tuple[list[TagLocation], list[BrokenChain]] | None:
+    """Answer from the sync daemon, or None when it is not running."""
+    from sync_daemon import query
+
+    request = {"cmd": args.command, "tag": getattr(args, "tag", "")}
+    response = query(root, request)
+    if not response or not response.get("ok"):
+        return None
+    locations = [TagLocation(**loc) for loc in response.get("locations", [])]
+    chains = [BrokenChain(c["tag_id"], tuple(c["present"]), tuple(c["missing"])) for c in response.get("broken", [])]
+    return locations, chains
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--no-refresh", action="store_true", help="query the index as of its last refresh")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("refresh", help="incrementally update the index")
+    where = sub.add_parser("where", help="locate a TAG")
+    where.add_argument("tag")
+    broken = sub.add_parser("broken", help="list broken TAG chains")
+    broken.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    root = find_project_root()
+    if args.command == "refresh":
+        with TagIndex(root) as index:
+            stats = index.refresh()
+        print(f"scanned {stats.scanned}, re-parsed {stats.parsed}, removed {stats.removed}")
+        return 0
+    answer = _daemon_query(root, args)
+    if answer is None:
+        with TagIndex(root) as index:
+            if not args.no_refresh or index.is_empty():
+                index.refresh()
+            kind, tag_id = split_tag(getattr(args, "tag", ""))
+            answer = (index.where(tag_id, kind) if args.command == "where" else [],
+                      index.broken_chains() if args.command == "broken" else [])
+    locations, chains = answer
+
+    if args.command == "where":
+        for loc in locations:
+            print(f"{loc.path}:{loc.line}: @{loc.kind}:{loc.tag_id}{':' + loc.sub if loc.sub else ''}")
+        return 0
+    if args.json:
+        print(json.dumps([asdict(c) for c in chains], ensure_ascii=False))
+    for chain in [] if args.json else chains:
+        print(f"{chain.tag_id}: missing {', '.join('@' + k for k in chain.missing)}")
+    return 1 if chains else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+"""TAG chain validation hook (`@SPEC → @TEST → @CODE → @DOC`).
+
+Asks the sync daemon for the current chain state when it is running, and
+otherwise refreshes the incremental TAG index itself. Reports broken chains
+and duplicate SPEC definitions. Advisory by default; `--strict` exits non-zero
+on findings.
+
+Usage:
+    python3 .moai/scripts/tag_validator.py [--strict]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+from moai_core import find_project_root
+from sync_daemon import query
+from tag_index import BrokenChain, TagIndex
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--strict", action="store_true", help="exit 1 when the TAG chain is broken")
+    args = parser.parse_args(argv)
+
+    root = find_project_root()
+    response = query(root, {"cmd": "broken"})
+    if response and response.get("ok"):
+        source = "sync daemon"
+        chains = [BrokenChain(c["tag_id"], tuple(c["present"]), tuple(c["missing"])) for c in response["broken"]]
+        duplicates = response["duplicates"]
+    else:
+        with TagIndex(root) as index:
+            stats = index.refresh()
+            chains = index.broken_chains()
+            duplicates = index.duplicate_specs()
+        source = f"{stats.parsed} of {stats.scanned} files re-parsed"
+
+    for chain in chains:
+        print(f"⚠️  {chain.tag_id}: missing {', '.join('@' + k for k in chain.missing)}")
+    for tag_id, paths in duplicates.items():
+        print(f"⚠️  @SPEC:{tag_id} defined in {len(paths)} files: {', '.join(paths)}")
+    if not chains and not duplicates:
+        print(f"✅ TAG chain intact ({source})")
+    return 1 if args.strict and (chains or duplicates) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""Test-impact selection for CI.
+
+Resolves the files changed since a base ref to TAG IDs (TAGs inside the
+changed files plus SPECs whose `scope` covers them, then their dependents),
+and from those IDs to the test files carrying a matching `@TEST:ID`.
+
+Only files named like tests (`test_*.py`, `*Test.java`, ...) are selected
+directly. Any other change under `tests/` or `src/test/` (helpers, fixtures,
+`__init__.py`, data files) may be used by any test, so it forces a full run.
+So does any other file that carries no TAG and is not covered by a SPEC scope,
+unless it is documentation (`*.md`, `docs/`, `.moai/specs/`, `.moai/memory/`).
+
+Exit status: 0 with the minimal selection on stdout (may be empty), or 3 when
+the mapping is incomplete and the full suite must run.
+
+Usage:
+    python3 .moai/scripts/test_selector.py --base origin/develop --format pytest
+    python3 .moai/scripts/test_selector.py --base "$BEFORE_SHA" --format gradle
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path, PurePosixPath
+
+from moai_core import find_project_root
+from spec_graph import load_graph
+from tag_index import TagIndex
+
+EXIT_FULL_RUN = 3
+NON_CODE_DIRS = ("docs/", ".moai/specs/", ".moai/memory/")
+NON_CODE_SUFFIXES = (".md",)
+FULL_RUN_FILES = frozenset({
+    "build.gradle", "build.gradle.kts", "settings.gradle", "settings.gradle.kts", "gradle.properties",
+    "pom.xml", "pyproject.toml", "setup.py", "setup.cfg", "requirements.txt", "conftest.py", "tox.ini",
+})
+FULL_RUN_DIRS = ("gradle/", ".github/workflows/", "src/test/resources/", "src/main/resources/")
+TEST_NAME = re.compile(r"(^test_.*\.py$|_test\.py$|Tests?\.(java|kt)$|IT\.(java|kt)$)")
+TEST_SUPPORT = re.compile(r"(?:^|/)(?:tests|src/test)/")
+JVM_TEST_ROOT = re.compile(r"(?:^|/)src/test/(?:java|kotlin)/(.+)\.(?:java|kt)$")
+JVM_PACKAGE = re.compile(r"^\s*package\s+([\w.]+)", re.MULTILINE)
+
+
+@dataclass
+class Selection:
+    changed: list[str] = field(default_factory=list)
+    tags: list[str] = field(default_factory=list)
+    tests: list[str] = field(default_factory=list)
+    full: bool = False
+    reason: str | None = None
+
+
+def changed_files(root: Path, base: str, head: str) -> list[str]:
+    if not base or set(base) == {"0"}:
+        raise ValueError(f"no usable base ref ({base or 'empty'})")
+    result = subprocess.run(
+        ["git", "diff", "--name-only", f"{base}...{head}"], cwd=root, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise ValueError(result.stderr.strip() or f"git diff {base}...{head} failed")
+    return result.stdout.splitlines()
+
+
+def is_test_file(rel: str) -> bool:
+    return bool(TEST_NAME.search(PurePosixPath(rel).name))
+
+
+def is_non_code(rel: str) -> bool:
+    return rel.startswith(NON_CODE_DIRS) or rel.endswith(NON_CODE_SUFFIXES)
+
+
+def full_run_reason(rel: str) -> str | None:
+    if PurePosixPath(rel).name in FULL_RUN_FILES or rel.startswith(FULL_RUN_DIRS):
+        return f"{rel} affects every test"
+    if TEST_SUPPORT.search(rel) and not is_test_file(rel):
+        return f"{rel} is test support code that any test may use"
+    return None
+
+
+def select(root: Path, changed: list[str]) -> Selection:
+    """Map changed files to the smallest test set, or flag a full run."""
+    selection = Selection(changed=changed)
+    graph = load_graph(root)
+    with TagIndex(root) as index:
+        index.refresh()
+        tests: set[str] = set()
+        tag_ids: set[str] = set()
+        code_ids: set[str] = set()
+        for rel in changed:
+            if reason := full_run_reason(rel):
+                return _full(selection, reason)
+            if is_test_file(rel):
+                if (root / rel).is_file():
+                    tests.add(rel)
+                continue
+            tags = index.tags_in(rel)
+            ids = {loc.tag_id for loc in tags} | graph.specs_for_paths([rel])
+            if not ids and not is_non_code(rel):
+                return _full(selection, f"{rel} carries no @TAG and no SPEC scope covers it")
+            tag_ids |= ids
+            code_ids |= {loc.tag_id for loc in tags if loc.kind == "CODE"}
+        tag_ids = graph.downstream(tag_ids)
+        for tag_id in sorted(code_ids):
+            if not index.files_for([tag_id], "TEST"):
+                return _full(selection, f"@CODE:{tag_id} has no @TEST:{tag_id}")
+        tests |= index.files_for(tag_ids, "TEST")
+    selection.tags = sorted(tag_ids)
+    selection.tests = sorted(tests)
+    return selection
+
+
+def _full(selection: Selection, reason: str) -> Selection:
+    selection.full = True
+    selection.reason = reason
+    return selection
+
+
+def pytest_targets(root: Path, tests: list[str]) -> list[str]:
+    return [rel for rel in tests if rel.endswith(".py")]
+
+
+def gradle_targets(root: Path, tests: list[str]) -> list[str]:
+    """Return `--tests` filters: FQCN when the package is known, else the simple class name."""
+    filters = []
+    for rel in tests:
+        path = PurePosixPath(rel)
+        if path.suffix not in (".java", ".kt"):
+            continue
+        if match := JVM_TEST_ROOT.search(rel):
+            filters.append(match.group(1).replace("/", "."))
+            continue
+        package = JVM_PACKAGE.search((root / rel).read_text(encoding="utf-8", errors="replace")[:4096])
+        filters.append(f"{package.group(1)}.{path.stem}" if package else path.stem)
+    return [arg for name in sorted(set(filters)) for arg in ("--tests", name)]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base", required=True, help="git ref the change is compared against")
+    parser.add_argument("--head", default="HEAD")
+    parser.add_argument("--format", choices=("pytest", "gradle", "json"), default="json")
+    args = parser.parse_args(argv)
+
+    root = find_project_root()
+    try:
+        selection = select(root, changed_files(root, args.base, args.head))
+    except ValueError as exc:
+        selection = _full(Selection(), str(exc))
+
+    if args.format == "json":
+        print(json.dumps(asdict(selection), ensure_ascii=False))
+    elif selection.full:
+        print(f"full test run: {selection.reason}", file=sys.stderr)
+    else:
+        targets = pytest_targets if args.format == "pytest" else gradle_targets
+        print(" ".join(targets(root, selection.tests)))
+    return EXIT_FULL_RUN if selection.full else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""Behaviour tests for fs_watch.py, run against throwaway trees.
+
+Run with: python3 -m unittest discover -s .moai/scripts/tests
+"""
+
+from __future__ import annotations
+
+import ctypes
+import errno
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import fs_watch  # noqa: E402
+from fs_watch import RESCAN, InotifyWatcher, PollingWatcher, make_watcher  # noqa: E402
+
+ROOTS = ("src", "tests")
+
+
+class WatcherTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.write("src/app.py", "x = 1\n")
+        self.write("docs/guide.md", "# Guide\n")
+
+    def write(self, rel: str, content: str) -> Path:
+        path = self.root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+        return path
+
+    def path(self, rel: str) -> str:
+        return str(self.root / rel)
+
+
+class PollingWatcherTest(WatcherTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.watcher = PollingWatcher(self.root, ROOTS, interval=0)
+
+    def test_quiet_tree_reports_nothing(self) -> None:
+        self.assertEqual(self.watcher.poll(0), set())
+
+    def test_created_modified_and_deleted_files(self) -> None:
+        self.write("tests/test_app.py", "")
+        self.write("src/app.py", "x = 2  # longer\n")
+        self.assertEqual(self.watcher.poll(0), {self.path("tests/test_app.py"), self.path("src/app.py")})
+        (self.root / "src/app.py").unlink()
+        self.assertEqual(self.watcher.poll(0), {self.path("src/app.py")})
+
+    def test_files_outside_the_roots_and_in_skipped_dirs_are_ignored(self) -> None:
+        self.write("docs/other.md", "")
+        self.write("src/__pycache__/app.cpython-311.pyc", "")
+        self.assertEqual(self.watcher.poll(0), set())
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux-only")
+class InotifyWatcherTest(WatcherTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        try:
+            self.watcher = InotifyWatcher(self.root, ROOTS)
+        except OSError as exc:
+            self.skipTest(f"inotify unavailable: {exc}")
+        self.addCleanup(self.watcher.close)
+
+    def collect(self, expected: set[str], deadline: float = 2.0) -> set[str]:
+        """Poll until every `expected` path was reported (or the deadline passes)."""
+        changed: set[str] = set()
+        end = time.monotonic() + deadline
+        while not expected <= changed and time.monotonic() < end:
+            changed |= self.watcher.poll(0.1)
+        return changed
+
+    def test_written_file_is_reported(self) -> None:
+        self.write("src/app.py", "x = 2\n")
+        self.assertIn(self.path("src/app.py"), self.collect({self.path("src/app.py")}))
+
+    def test_new_directory_is_watched_with_its_files(self) -> None:
+        created = self.write("src/pkg/mod.py", "")
+        self.assertIn(str(created), self.collect({str(created)}))
+        later = self.write("src/pkg/later.py", "")
+        self.assertIn(str(later), self.collect({str(later)}))
+
+    def test_root_created_after_start_is_watched(self) -> None:
+        created = self.write("tests/test_app.py", "")
+        self.assertIn(str(created), self.collect({str(created)}))
+
+    def test_deleted_directory_asks_for_a_rescan(self) -> None:
+        self.write("src/pkg/mod.py", "")
+        self.collect({self.path("src/pkg/mod.py")})
+        shutil.rmtree(self.root / "src/pkg")
+        self.assertIn(RESCAN, self.collect({RESCAN}))
+
+    def test_files_outside_the_roots_and_in_skipped_dirs_are_ignored(self) -> None:
+        self.write("docs/other.md", "")
+        self.write("src/__pycache__/app.cpython-311.pyc", "")
+        marker = self.write("src/marker.py", "")
+        self.assertEqual(self.collect({str(marker)}) - {str(marker)}, set())
+
+    def test_queue_overflow_asks_for_a_rescan(self) -> None:
+        event = fs_watch.EVENT_HEADER.pack(-1, fs_watch.IN_Q_OVERFLOW, 0, 0)
+        self.assertEqual(self.watcher._decode(event), {RESCAN})
+
+    def test_watch_limit_on_a_new_directory_raises(self) -> None:
+        def exhausted(fd: int, path: bytes, mask: int) -> int:
+            ctypes.set_errno(errno.ENOSPC)
+            return -1
+
+        self.watcher._add_watch = exhausted
+        self.write("src/pkg/mod.py", "")
+        with self.assertRaises(OSError) as raised:
+            self.collect({self.path("src/pkg/mod.py")})
+        self.assertEqual(raised.exception.errno, errno.ENOSPC)
+
+    def test_close_is_idempotent(self) -> None:
+        self.watcher.close()
+        self.watcher.close()
+
+
+class MakeWatcherTest(WatcherTestCase):
+    def test_force_polling(self) -> None:
+        self.assertIsInstance(make_watcher(self.root, ROOTS, force_polling=True), PollingWatcher)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""Behaviour tests for hdr_histogram.py.
+
+Run with: python3 -m unittest discover -s .moai/scripts/tests
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from hdr_histogram import Histogram  # noqa: E402
+
+
+class BucketTest(unittest.TestCase):
+    def test_small_values_have_their_own_bucket(self) -> None:
+        hist = Histogram(sub_bits=4)
+        for value in range(16):
+            self.assertEqual(hist._index(value), value)
+            self.assertEqual(hist._highest_equivalent(value), value)
+
+    def test_buckets_are_contiguous_and_ordered(self) -> None:
+        hist = Histogram(sub_bits=4)
+        for index in range(16, 200):
+            high = hist._highest_equivalent(index)
+            self.assertEqual(hist._index(high), index)
+            self.assertEqual(hist._index(high + 1), index + 1)
+
+    def test_relative_error_is_bounded(self) -> None:
+        rng = random.Random(7)
+        values = [*(1 << n for n in range(40)), *((1 << n) - 1 for n in range(1, 40)),
+                  *(rng.randrange(1, 1 << 40) for _ in range(2000))]
+        for sub_bits in (4, 11):
+            hist = Histogram(sub_bits)
+            bound = 2 / 2 ** sub_bits
+            for value in values:
+                high = hist._highest_equivalent(hist._index(value))
+                self.assertGreaterEqual(high, value)
+                self.assertLessEqual(high - value, bound * value, (sub_bits, value))
+
+
+class PercentileTest(unittest.TestCase):
+    def test_empty_histogram(self) -> None:
+        hist = Histogram()
+        self.assertEqual((hist.percentile(99), hist.mean(), hist.summary()["count"]), (0, 0.0, 0))
+
+    def test_exact_percentiles_below_the_linear_range(self) -> None:
+        hist = Histogram()
+        for value in range(1, 1001):
+            hist.record(value)
+        self.assertEqual([hist.percentile(p) for p in (50, 90, 99, 99.9, 100)], [500, 900, 990, 999, 1000])
+        self.assertEqual((hist.min, hist.max, hist.total), (1, 1000, 1000))
+        self.assertAlmostEqual(hist.mean(), 500.5)
+
+    def test_percentiles_never_exceed_the_maximum(self) -> None:
+        hist = Histogram()
+        hist.record(1_000_001)
+        self.assertEqual(hist.percentile(50), 1_000_001)
+
+    def test_large_values_stay_within_the_error_bound(self) -> None:
+        hist = Histogram()
+        for value in range(1, 100_001):
+            hist.record(value * 100)
+        p99 = hist.percentile(99)
+        self.assertLessEqual(abs(p99 - 9_900_000), 9_900_000 * 2 / 2 ** 11)
+
+    def test_counts_and_negative_values(self) -> None:
+        hist = Histogram()
+        hist.record(-5)
+        hist.record(10, count=9)
+        self.assertEqual((hist.min, hist.total, hist.percentile(10), hist.percentile(11)), (0, 10, 0, 10))
+
+    def test_summary_scales_and_names_percentiles(self) -> None:
+        hist = Histogram()
+        hist.record(1500)
+        summary = hist.summary(scale=1000)
+        self.assertEqual(sorted(summary), ["count", "max", "mean", "min", "p50", "p90", "p99", "p999"])
+        self.assertEqual((summary["min"], summary["p999"], summary["max"]), (1.5, 1.5, 1.5))
+
+
+class MergeTest(unittest.TestCase):
+    def test_merge_equals_recording_everything_in_one(self) -> None:
+        rng = random.Random(3)
+        values = [rng.randrange(1, 10_000_000) for _ in range(5000)]
+        left, right, whole = Histogram(), Histogram(), Histogram()
+        for i, value in enumerate(values):
+            (left if i % 2 else right).record(value)
+            whole.record(value)
+        left.merge(right)
+        self.assertEqual((left.counts, left.total, left.min, left.max),
+                         (whole.counts, whole.total, whole.min, whole.max))
+
+    def test_merging_into_or_from_an_empty_histogram(self) -> None:
+        hist, empty = Histogram(), Histogram()
+        hist.record(7)
+        hist.merge(empty)
+        empty.merge(hist)
+        self.assertEqual((hist.min, empty.min, empty.total), (7, 7, 1))
+
+    def test_precision_mismatch_raises(self) -> None:
+        with self.assertRaises(ValueError):
+            Histogram(8).merge(Histogram(11))
+
+
+if __name__ == "__main__":
+    unittest.main()
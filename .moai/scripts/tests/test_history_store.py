@@ -0,0 +1,205 @@
+"""Behaviour tests for history_store.py, run against throwaway projects.
+
+Run with: python3 -m unittest discover -s .moai/scripts/tests
+"""
+
+from __future__ import annotations
+
+import contextlib
+import datetime as dt
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import history_store  # noqa: E402
+from history_store import HistoryStore, parse_history  # noqa: E402
+from moai_core import read_spec_header  # noqa: E402
+from tag_index import VersionRef  # noqa: E402
+
+SPEC = """---
+id: {id}
+version: {version}
+---
+
+# @SPEC:{id}
+
+## HISTORY
+
+### v0.2.0 (2025-10-20)
+- **ADDED**: refund endpoint
+- **AUTHOR**: @alice
+
+### v0.1.0 (2025-10-01)
+- **INITIAL**: first draft
+- **AUTHOR**: @bob
+- **REVIEW**: @carol
+
+---
+
+## Body
+- **ADDED**: not a HISTORY entry
+"""
+
+
+class ParseHistoryTest(unittest.TestCase):
+    def test_rows_carry_their_version_block(self) -> None:
+        header = read_spec_header(SPEC.format(id="PAY-001", version="0.2.0").splitlines(keepends=True))
+        rows = parse_history(header.history_lines)
+        self.assertEqual(rows, [
+            ((0, 2, 0), dt.date(2025, 10, 20).toordinal(), "ADDED", "@alice", "", "refund endpoint"),
+            ((0, 1, 0), dt.date(2025, 10, 1).toordinal(), "INITIAL", "@bob", "@carol", "first draft"),
+        ])
+
+    def test_impossible_date_is_stored_as_unknown(self) -> None:
+        warnings: list[str] = []
+        rows = parse_history(["### v0.0.1 (2025-10-32)", "- **INITIAL**: draft"], warnings)
+        self.assertEqual(rows, [((0, 0, 1), 0, "INITIAL", "", "", "draft")])
+        self.assertEqual(warnings, ["v0.0.1: invalid date 2025-10-32; stored as unknown"])
+
+    def test_version_too_large_for_the_columns_is_skipped(self) -> None:
+        warnings: list[str] = []
+        rows = parse_history(["### v0.70000.0 (2025-10-01)", "- **ADDED**: x", "### v0.1.0", "- **INITIAL**: y"],
+                             warnings)
+        self.assertEqual(rows, [((0, 1, 0), 0, "INITIAL", "", "", "y")])
+        self.assertEqual(len(warnings), 1)
+        self.assertIn("v0.70000.0", warnings[0])
+
+    def test_unknown_bullets_and_text_before_the_first_header_are_ignored(self) -> None:
+        self.assertEqual(parse_history(["- **ADDED**: orphan", "### v0.1.0", "- **NOTE**: aside"]), [])
+
+
+class HistoryStoreTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.write("ORDER-001")
+        self.write("PAY-001", version="0.2.0")
+
+    def write(self, spec_dir: str, spec_id: str | None = None, version: str = "0.1.0", text: str | None = None) -> Path:
+        path = self.root / f".moai/specs/SPEC-{spec_dir}/spec.md"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text or SPEC.format(id=spec_id or spec_dir, version=version), encoding="utf-8")
+        return path
+
+    def rows(self, store: HistoryStore, spec: str) -> list[tuple[str, str]]:
+        return [(row["version"], row["change"]) for row in store.changes() if row["spec"] == spec]
+
+
+class RefreshTest(HistoryStoreTestCase):
+    def test_refresh_is_incremental_and_persistent(self) -> None:
+        store = HistoryStore(self.root)
+        self.assertEqual(store.refresh(), (2, 0))
+        self.assertEqual(len(store), 4)
+        self.assertEqual(store.refresh(), (0, 0))
+        reloaded = HistoryStore(self.root)
+        self.assertEqual(reloaded.changes(), store.changes())
+        self.assertEqual(reloaded.refresh(), (0, 0))
+
+    def test_edited_spec_replaces_only_its_own_rows(self) -> None:
+        store = HistoryStore(self.root)
+        store.refresh()
+        text = SPEC.format(id="PAY-001", version="0.3.0").replace("## HISTORY\n", "## HISTORY\n\n### v0.3.0\n"
+                                                                  "- **FIXED**: rounding\n")
+        self.write("PAY-001", text=text)
+        self.assertEqual(store.refresh(), (1, 0))
+        self.assertEqual(self.rows(store, "PAY-001"), [("0.3.0", "FIXED"), ("0.2.0", "ADDED"), ("0.1.0", "INITIAL")])
+        self.assertEqual(len(self.rows(store, "ORDER-001")), 2)
+
+    def test_removed_spec_drops_its_rows_and_strings(self) -> None:
+        store = HistoryStore(self.root)
+        store.refresh()
+        shutil.rmtree(self.root / ".moai/specs/SPEC-PAY-001")
+        self.assertEqual(store.refresh(), (0, 1))
+        self.assertEqual(self.rows(store, "PAY-001"), [])
+        self.assertNotIn("PAY-001", store.strings)
+        self.assertNotIn(".moai/specs/SPEC-PAY-001/spec.md", store.strings)
+        self.assertEqual(len(HistoryStore(self.root)), 2)
+
+    def test_duplicate_spec_ids_keep_each_files_rows(self) -> None:
+        store = HistoryStore(self.root)
+        store.refresh()
+        copy = self.write("ORDER-999", spec_id="ORDER-001")
+        store.refresh()
+        self.assertEqual(len(self.rows(store, "ORDER-001")), 4)
+        copy.write_text(copy.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+        store.refresh()
+        self.assertEqual(len(self.rows(store, "ORDER-001")), 4)
+        shutil.rmtree(copy.parent)
+        self.assertEqual(store.refresh(), (0, 1))
+        self.assertEqual(len(self.rows(store, "ORDER-001")), 2)
+        self.assertEqual(len(self.rows(HistoryStore(self.root), "ORDER-001")), 2)
+
+    def test_store_from_an_older_format_is_rebuilt(self) -> None:
+        cache = self.root / ".moai/cache/history.bin"
+        cache.parent.mkdir(parents=True)
+        cache.write_bytes(b"MOAIHST1" + b"\0" * 64)
+        store = HistoryStore(self.root)
+        self.assertEqual(len(store), 0)
+        self.assertEqual(store.refresh(), (2, 0))
+        self.assertTrue(cache.read_bytes().startswith(history_store.MAGIC))
+
+
+class MalformedHistoryTest(HistoryStoreTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        bad = SPEC.format(id="BAD-001", version="0.2.0").replace("2025-10-20", "2025-10-32")
+        self.write("BAD-001", text=bad.replace("### v0.1.0", "### v0.1.65536"))
+        cwd = Path.cwd()
+        (self.root / ".moai/config.json").write_text("{}", encoding="utf-8")
+        os.chdir(self.root)
+        self.addCleanup(os.chdir, cwd)
+
+    def test_refresh_keeps_good_rows_and_records_warnings(self) -> None:
+        store = HistoryStore(self.root)
+        store.refresh()
+        self.assertEqual(self.rows(store, "BAD-001"), [("0.2.0", "ADDED")])
+        self.assertEqual([row["date"] for row in store.changes() if row["spec"] == "BAD-001"], [None])
+        self.assertEqual([w.split(": ", 1)[0] for w in HistoryStore(self.root).warnings()],
+                         [".moai/specs/SPEC-BAD-001/spec.md"] * 2)
+
+    def test_queries_still_answer_and_warn(self) -> None:
+        out, err = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            code = history_store.main(["changes", "--since", "2025-10-15", "--json"])
+        self.assertEqual(code, 0)
+        self.assertIn("PAY-001", out.getvalue())
+        self.assertNotIn("BAD-001", out.getvalue())
+        self.assertIn("invalid date 2025-10-32", err.getvalue())
+        self.assertIn("v0.1.65536", err.getvalue())
+
+
+class QueryTest(HistoryStoreTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.store = HistoryStore(self.root)
+        self.store.refresh()
+
+    def test_changes_filter_by_date_and_type(self) -> None:
+        rows = self.store.changes(dt.date(2025, 10, 15), ["ADDED"])
+        self.assertEqual(sorted(row["spec"] for row in rows), ["ORDER-001", "PAY-001"])
+        self.assertEqual(self.store.changes(types=["BREAKING"]), [])
+
+    def test_stale_refs_compare_against_the_current_version(self) -> None:
+        refs = [VersionRef("PAY-001", "0.1.0", "src/pay.py", 3), VersionRef("PAY-001", "0.2.0", "src/pay.py", 4),
+                VersionRef("NOPE-001", "0.1.0", "src/x.py", 1)]
+        self.assertEqual(self.store.stale_refs(refs), [{"spec": "PAY-001", "referenced": "0.1.0", "current": "0.2.0",
+                                                        "path": "src/pay.py", "line": 3}])
+
+    def test_bump_mismatches(self) -> None:
+        text = SPEC.format(id="PAY-001", version="0.2.1").replace("## HISTORY\n", "## HISTORY\n\n### v0.2.1\n"
+                                                                  "- **ADDED**: partial refunds\n")
+        self.write("PAY-001", text=text)
+        self.store.refresh()
+        self.assertEqual(self.store.bump_mismatches(), [{"spec": "PAY-001", "version": "0.2.1", "from": "0.2.0",
+                                                         "actual": "patch", "implied": "minor"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+"""Behaviour tests for the load harness (loadgen.py and its stand-in backend and client).
+
+Run with: python3 -m unittest discover -s .moai/scripts/tests
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import tempfile
+import unittest
+from collections import Counter
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import loadgen  # noqa: E402
+from loadgen import RunStats, Scenario, check_inventory, load_scenario  # noqa: E402
+from loadgen_backend import StandInBackend  # noqa: E402
+from loadgen_client import HttpPool  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+FLASH_BUY = {"name": "flash-buy", "steps": [{"op": "decrement", "sku": "hot", "quantity": 1}]}
+CHECKOUT = {"name": "checkout", "steps": [{"op": "view", "sku": "hot"}, {"op": "cart"},
+                                          {"op": "add", "sku": "hot", "quantity": 2}, {"op": "order"}, {"op": "pay"}]}
+
+
+def scenario(flows: list[dict[str, Any]], rate: float = 400, duration_s: float = 0.3, **fields: Any) -> Scenario:
+    fields.setdefault("seed", {"products": 20, "stock": 100, "hot_skus": 2, "hot_stock": 30})
+    fields.setdefault("backend", {"latency_ms": 1})
+    return Scenario(name="test", flows=flows, rate=rate, duration_s=duration_s, **fields)
+
+
+def flow_counts(result: dict[str, Any]) -> int:
+    return sum(op["count"] for name, op in result["ops"].items() if name.startswith("flow:"))
+
+
+class LoadScenarioTest(unittest.TestCase):
+    def test_shipped_scenarios_load(self) -> None:
+        for name in ("checkout", "hot-sku"):
+            with self.subTest(name=name):
+                loaded = load_scenario(name, REPO_ROOT)
+                self.assertEqual(loaded.name, name)
+                self.assertGreater(loaded.rate, 0)
+
+    def test_invalid_scenarios_are_rejected(self) -> None:
+        cases = {
+            "unknown op": {"flows": [{"name": "f", "steps": [{"op": "refund"}]}]},
+            "needs 'cart'": {"flows": [{"name": "f", "steps": [{"op": "add"}]}]},
+            "arrival.process": {"flows": [FLASH_BUY], "arrival": {"process": "bursty"}},
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            for message, data in cases.items():
+                with self.subTest(message=message):
+                    path = Path(tmp, "bad.json")
+                    path.write_text(json.dumps({"name": "bad", **data}), encoding="utf-8")
+                    with self.assertRaisesRegex(ValueError, message):
+                        load_scenario(str(path), Path(tmp))
+
+
+class CheckInventoryTest(unittest.TestCase):
+    def stats(self, confirmed: dict[str, int], unknown: dict[str, int] | None = None) -> RunStats:
+        return RunStats(confirmed=Counter(confirmed), unknown=Counter(unknown or {}))
+
+    def test_consistent_ledger(self) -> None:
+        self.assertEqual(check_inventory({"A": 10}, {"A": 7}, self.stats({"A": 3})), [])
+
+    def test_oversold_and_negative_stock(self) -> None:
+        [violation] = check_inventory({"A": 2}, {"A": -1}, self.stats({"A": 3}))
+        self.assertEqual(violation["problems"], ["negative stock", "oversold"])
+
+    def test_lost_update(self) -> None:
+        [violation] = check_inventory({"A": 10}, {"A": 9}, self.stats({"A": 3}))
+        self.assertEqual(violation["problems"], ["lost update"])
+
+    def test_unknown_reservations_widen_the_tolerance(self) -> None:
+        self.assertEqual(check_inventory({"A": 10}, {"A": 5}, self.stats({"A": 3}, {"A": 2})), [])
+        self.assertEqual(check_inventory({"A": 10}, {"A": 7}, self.stats({"A": 3}, {"A": 2})), [])
+        self.assertEqual(len(check_inventory({"A": 10}, {"A": 4}, self.stats({"A": 3}, {"A": 2}))), 1)
+
+
+class StandInTest(unittest.TestCase):
+    def test_checkout_round_trip_over_keep_alive(self) -> None:
+        async def run() -> list[tuple[int, Any]]:
+            backend = StandInBackend()
+            backend.seed(products=3, stock=5)
+            server = await backend.start()
+            pool = HttpPool(f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}", size=2)
+            try:
+                _, cart = await pool.request("POST", "/api/carts")
+                responses = [await pool.request("POST", f"/api/carts/{cart['cartId']}/items",
+                                                {"sku": "SKU-00001", "quantity": 2})]
+                status, order = await pool.request("POST", "/api/orders", {"cartId": cart["cartId"]})
+                responses += [(status, order),
+                              await pool.request("POST", "/api/payments", {"orderId": order["orderId"], "amount": 1}),
+                              await pool.request("POST", "/api/payments",
+                                                 {"orderId": order["orderId"], "amount": order["amount"]}),
+                              await pool.request("POST", "/api/inventory/SKU-00002/decrement", {"quantity": 9}),
+                              await pool.request("GET", "/api/products/nope")]
+                _, stock = await pool.request("GET", "/api/inventory")
+                responses.append((pool.opened, stock))
+            finally:
+                await pool.close()
+                await backend.stop()
+            return responses
+
+        added, order, bad_amount, paid, short, missing, (opened, stock) = asyncio.run(run())
+        self.assertEqual(added, (200, {"cartId": 1, "items": {"SKU-00001": 2}}))
+        self.assertEqual(order[0], 201)
+        self.assertEqual((bad_amount[0], paid[0], short, missing[0]),
+                         (400, 201, (409, {"error": "OUT_OF_STOCK", "sku": "SKU-00002"}), 404))
+        self.assertEqual(stock, {"SKU-00000": 5, "SKU-00001": 3, "SKU-00002": 5})
+        self.assertEqual(opened, 1)
+
+
+class RunTest(unittest.TestCase):
+    def test_every_started_flow_is_recorded(self) -> None:
+        result = asyncio.run(loadgen.run_once(scenario([CHECKOUT, FLASH_BUY]), 300, None))
+        self.assertEqual(result["violations"], [])
+        self.assertEqual(flow_counts(result), result["started"])
+        self.assertEqual(result["cancelled"], 0)
+
+    def test_per_sku_locking_prevents_overselling(self) -> None:
+        result = asyncio.run(loadgen.run_once(scenario([FLASH_BUY], rate=2000), 2000, None))
+        self.assertEqual(result["violations"], [])
+        self.assertGreater(result["ops"]["decrement"].get("rejected", 0), 0)
+
+    def test_missing_locks_are_caught_by_the_checker(self) -> None:
+        race = scenario([FLASH_BUY], rate=2000, backend={"latency_ms": 1, "locking": "none"})
+        result = asyncio.run(loadgen.run_once(race, 2000, None))
+        self.assertTrue(result["violations"])
+        self.assertIn("lost update", result["violations"][0]["problems"])
+
+    def test_flows_cut_off_by_the_drain_are_recorded_as_unknown(self) -> None:
+        slow = scenario([FLASH_BUY, CHECKOUT], rate=200, duration_s=0.2, backend={"latency_ms": 400})
+
+        async def run() -> RunStats:
+            backend = StandInBackend(**slow.backend)
+            backend.seed(**slow.seed)
+            server = await backend.start()
+            pool = HttpPool(f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}", size=64)
+            try:
+                return await loadgen.drive(pool, slow, slow.rate)
+            finally:
+                await pool.close()
+                await backend.stop()
+
+        with mock.patch.object(loadgen, "DRAIN_TIMEOUT_S", 0.05):
+            stats = asyncio.run(run())
+        flows = sum(sum(counts.values()) for name, counts in stats.outcomes.items() if name.startswith("flow:"))
+        self.assertGreater(stats.cancelled, 0)
+        self.assertEqual(flows, stats.started)
+        self.assertEqual(sum(hist.total for name, hist in stats.ops.items() if name.startswith("flow:")), stats.started)
+        flash = stats.outcomes["flow:flash-buy"]
+        self.assertEqual(sum(stats.unknown.values()), flash["unknown"])
+        slowest = max(hist.max for name, hist in stats.ops.items() if name.startswith("flow:"))
+        self.assertGreaterEqual(slowest, 200_000)
+        report = loadgen.report(slow, slow.rate, stats, [], 1)
+        self.assertEqual(report["cancelled"], stats.cancelled)
+        self.assertGreater(report["error_rate"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""Behaviour tests for the shared parsers in moai_core.py.
+
+Run with: python3 -m unittest discover -s .moai/scripts/tests
+"""
+
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from moai_core import parse_yaml_block, read_spec_header  # noqa: E402
+
+
+def parse(text: str) -> dict:
+    return parse_yaml_block(text.splitlines())
+
+
+class ParseYamlBlockTest(unittest.TestCase):
+    def test_plain_scalars_are_strings(self) -> None:
+        self.assertEqual(parse("id: AUTH-001\nversion: 0.1.0\npriority: high"),
+                         {"id": "AUTH-001", "version": "0.1.0", "priority": "high"})
+
+    def test_handle_values_pyyaml_would_reject(self) -> None:
+        self.assertEqual(parse("author: @Goos"), {"author": "@Goos"})
+
+    def test_trailing_comments_are_dropped(self) -> None:
+        self.assertEqual(parse("status: draft  # until review"), {"status": "draft"})
+
+    def test_quoted_values_keep_hash_signs(self) -> None:
+        self.assertEqual(parse('title: "Fix #12 now"  # note\nissue: \'#34\''), {"title": "Fix #12 now", "issue": "#34"})
+
+    def test_inline_lists(self) -> None:
+        self.assertEqual(parse('depends_on: [AUTH-001, "PAY-001" , ]\nblocks: []'),
+                         {"depends_on": ["AUTH-001", "PAY-001"], "blocks": []})
+
+    def test_block_list_items_at_the_key_indent(self) -> None:
+        self.assertEqual(parse("depends_on:\n- AUTH-001\n- PAY-001\nstatus: active"),
+                         {"depends_on": ["AUTH-001", "PAY-001"], "status": "active"})
+
+    def test_indented_block_lists_and_nested_mappings(self) -> None:
+        text = "scope:\n  packages:\n    - src/auth\n    - src/pay\n  files: [a.py]\nstatus: active"
+        self.assertEqual(parse(text), {"scope": {"packages": ["src/auth", "src/pay"], "files": ["a.py"]},
+                                       "status": "active"})
+
+    def test_key_without_value_is_none(self) -> None:
+        self.assertEqual(parse("related_specs:\nstatus: draft"), {"related_specs": None, "status": "draft"})
+
+    def test_comment_lines_and_blank_lines_are_skipped(self) -> None:
+        self.assertEqual(parse("# header\n\nid: AUTH-001\n  # indented comment\n"), {"id": "AUTH-001"})
+
+    def test_non_mapping_documents_yield_an_empty_dict(self) -> None:
+        self.assertEqual(parse("- a\n- b"), {})
+        self.assertEqual(parse(""), {})
+
+
+class ReadSpecHeaderTest(unittest.TestCase):
+    def test_reads_front_matter_and_history_only(self) -> None:
+        text = ("---\nid: AUTH-001\nversion: 0.1.0\n---\n\n# @SPEC:AUTH-001\n\n## HISTORY\n\n"
+                "### v0.1.0 (2025-10-02)\n- done\n\n### v0.0.1\n- draft\n\n---\n\n## Body\n")
+        header = read_spec_header(text.splitlines(keepends=True))
+        self.assertTrue(header.has_front_matter and header.has_history)
+        self.assertEqual(header.front_matter, {"id": "AUTH-001", "version": "0.1.0"})
+        self.assertEqual(header.history, [("0.1.0", "2025-10-02", 10), ("0.0.1", None, 13)])
+
+    def test_unterminated_front_matter_is_reported(self) -> None:
+        header = read_spec_header(["---\n", "id: AUTH-001\n"])
+        self.assertFalse(header.has_front_matter)
+
+
+if __name__ == "__main__":
+    unittest.main()
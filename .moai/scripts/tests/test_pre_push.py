@@ -0,0 +1,237 @@
+"""Behaviour tests for pre_push.py, run against throwaway repositories.
+
+Run with: python3 -m unittest discover -s .moai/scripts/tests
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pre_push  # noqa: E402
+from pre_push import Git  # noqa: E402
+
+ZERO = "0" * 40
+SPEC = """---
+id: {id}
+version: 0.1.0
+status: active
+created: 2025-10-01
+updated: 2025-10-01
+author: @tester
+priority: medium
+---
+
+## HISTORY
+
+### v0.1.0 (2025-10-01)
+"""
+
+
+class RepoTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.run_git("init", "-q", "-b", "develop")
+        self.commit({".moai/config.json": "{}", ".gitignore": ".moai/cache/\n",
+                     ".moai/specs/SPEC-AUTH-001/spec.md": SPEC.format(id="AUTH-001")})
+        self.git = Git(self.root, time.monotonic() + 30)
+
+    def run_git(self, *args: str) -> str:
+        return subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+                              cwd=self.root, capture_output=True, text=True, check=True).stdout
+
+    def commit(self, files: dict[str, str | None], message: str = "change") -> str:
+        for rel, content in files.items():
+            path = self.root / rel
+            if content is None:
+                path.unlink()
+                continue
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding="utf-8")
+        self.run_git("add", "-A")
+        self.run_git("commit", "-q", "-m", message)
+        return self.run_git("rev-parse", "HEAD").strip()
+
+
+class BranchAdvisoryTest(RepoTestCase):
+    def advisories(self, target: str, local: str = "refs/heads/feature/x") -> list[str]:
+        head = self.run_git("rev-parse", "HEAD").strip()
+        return pre_push.branch_advisories(self.git, local, head, f"refs/heads/{target}", ZERO)
+
+    def test_policy_branch_names_pass(self) -> None:
+        for target in ("feature/SPEC-AUTH-001", "feature/SPEC-001-new-feature", "feature/SPEC-123",
+                       "feature/SPEC-UPDATE-REFACTOR-001-docs", "develop", "hotfix/login", "release/1.2.0"):
+            with self.subTest(target=target):
+                self.assertEqual(self.advisories(target), [])
+
+    def test_feature_branch_without_spec_id_gets_the_naming_advisory(self) -> None:
+        for target in ("feature/login", "feature/SPEC-AUTH", "feature/SPEC-001_"):
+            with self.subTest(target=target):
+                self.assertEqual(len(self.advisories(target)), 1)
+                self.assertIn("should be named feature/SPEC-{ID}", self.advisories(target)[0])
+
+    def test_push_to_main_from_a_feature_branch_gets_the_gitflow_advice(self) -> None:
+        notes = self.advisories("main", "refs/heads/feature/SPEC-001-new-feature")
+        self.assertEqual(len(notes), 1)
+        self.assertIn("Current branch: feature/SPEC-001-new-feature", notes[0])
+        self.assertEqual(self.advisories("main", "refs/heads/develop"), [])
+
+    def test_unknown_branch_and_protected_deletions(self) -> None:
+        self.assertIn("is not a GitFlow branch", self.advisories("wip")[0])
+        self.assertEqual(pre_push.branch_advisories(self.git, "(delete)", ZERO, "refs/heads/develop", ZERO),
+                         ["⚠️  ADVISORY: deleting remote branch develop"])
+
+    def test_force_push_is_detected(self) -> None:
+        base = self.run_git("rev-parse", "HEAD").strip()
+        old = self.commit({"src/a.py": "a = 1\n"})
+        self.run_git("reset", "-q", "--hard", base)
+        new = self.commit({"src/a.py": "a = 2\n"})
+        notes = pre_push.branch_advisories(self.git, "refs/heads/develop", new, "refs/heads/develop", old)
+        self.assertEqual(notes, ["⚠️  ADVISORY: Force-push to develop detected — prefer a reviewed PR"])
+
+
+class ParserTest(RepoTestCase):
+    def test_changed_blobs_keeps_added_and_modified_checked_paths(self) -> None:
+        first = self.commit({"src/app.py": "# @CODE:AUTH-001\n", "src/ünïcode name.py": "x\n",
+                             "README.md": "# readme\n", "build.gradle": ""})
+        second = self.commit({"src/app.py": "# @CODE:AUTH-002\n", "src/ünïcode name.py": None,
+                              "tests/test_app.py": "# @TEST:AUTH-001\n",
+                              ".moai/specs/SPEC-AUTH-001/spec.md": SPEC.format(id="AUTH-001") + "\n",
+                              ".moai/specs/SPEC-AUTH-001/plan.md": "plan\n"})
+        blobs = pre_push.changed_blobs(self.git, [first, second])
+        blob = self.run_git("rev-parse", f"{first}:src/ünïcode name.py").strip()
+        self.assertEqual(sorted(blobs[first]), [("src/app.py", self.run_git("rev-parse", f"{first}:src/app.py").strip()),
+                                                ("src/ünïcode name.py", blob)])
+        self.assertEqual(sorted(path for path, _ in blobs[second]),
+                         [".moai/specs/SPEC-AUTH-001/spec.md", "src/app.py", "tests/test_app.py"])
+
+    def test_changed_blobs_handles_the_root_commit_and_empty_commits(self) -> None:
+        root_commit = self.run_git("rev-list", "--max-parents=0", "HEAD").strip()
+        self.run_git("commit", "-q", "--allow-empty", "-m", "empty")
+        empty = self.run_git("rev-parse", "HEAD").strip()
+        blobs = pre_push.changed_blobs(self.git, [root_commit, empty])
+        self.assertEqual([path for path, _ in blobs[root_commit]], [".moai/specs/SPEC-AUTH-001/spec.md"])
+        self.assertEqual(blobs[empty], [])
+
+    def test_read_blobs_splits_the_batch_output(self) -> None:
+        head = self.commit({"src/a.py": "line 1\nline 2\n", "src/b.py": "", "src/c.py": "ü\n\n"})
+        shas = {rel: self.run_git("rev-parse", f"{head}:{rel}").strip() for rel in ("src/a.py", "src/b.py", "src/c.py")}
+        missing = "1" * 40
+        contents = pre_push.read_blobs(self.git, {*shas.values(), missing})
+        self.assertEqual(contents, {shas["src/a.py"]: "line 1\nline 2\n", shas["src/b.py"]: "",
+                                    shas["src/c.py"]: "ü\n\n"})
+
+    def test_read_blobs_skips_git_for_an_empty_set(self) -> None:
+        with mock.patch.object(self.git, "run") as run:
+            self.assertEqual(pre_push.read_blobs(self.git, set()), {})
+        run.assert_not_called()
+
+
+class CacheTest(RepoTestCase):
+    def check(self, local_sha: str, remote_sha: str = ZERO, cache: dict | None = None) -> tuple[list[str], dict]:
+        cache = cache if cache is not None else pre_push.load_cache(self.root / "missing.json")
+        notes: list[str] = []
+        update = ["refs/heads/feature/SPEC-AUTH-001", local_sha, "refs/heads/feature/SPEC-AUTH-001", remote_sha]
+        pre_push.check_push(self.git, "origin", [update], cache, notes)
+        return notes, cache
+
+    def test_orphan_tags_and_spec_errors_are_reported_per_commit(self) -> None:
+        base = self.run_git("rev-parse", "HEAD").strip()
+        head = self.commit({"src/pay.py": "# @CODE:PAY-001\n# @CODE:AUTH-001\n",
+                            ".moai/specs/SPEC-AUTH-001/spec.md": SPEC.format(id="AUTH-001").replace("@tester", "x")})
+        notes, cache = self.check(head, base)
+        self.assertEqual(notes, [f"⚠️  {head[:8]} .moai/specs/SPEC-AUTH-001/spec.md: "
+                                 "author `x` must be a single @GitHubHandle",
+                                 f"⚠️  {head[:8]} @CODE:PAY-001 has no SPEC-PAY-001"])
+        self.assertEqual(list(cache["commits"]), [head])
+        self.assertEqual(len(cache["blobs"]), 2)
+
+    def test_rebased_commits_reuse_blob_verdicts(self) -> None:
+        base = self.run_git("rev-parse", "HEAD").strip()
+        feature = self.commit({"src/pay.py": "# @CODE:PAY-001\n"})
+        _, cache = self.check(feature, base)
+        self.run_git("checkout", "-q", "-b", "other", base)
+        moved = self.commit({"docs/notes.txt": "unrelated\n"})
+        self.run_git("cherry-pick", feature)
+        rebased = self.run_git("rev-parse", "HEAD").strip()
+        with mock.patch.object(pre_push, "read_blobs", wraps=pre_push.read_blobs) as read_blobs:
+            notes, cache = self.check(rebased, base, cache)
+        read_blobs.assert_called_once_with(self.git, {self.run_git("rev-parse", f"{moved}:docs/notes.txt").strip()})
+        self.assertEqual(notes, [f"⚠️  {rebased[:8]} @CODE:PAY-001 has no SPEC-PAY-001"])
+
+    def test_already_pushed_commits_cost_no_diff_tree(self) -> None:
+        base = self.run_git("rev-parse", "HEAD").strip()
+        head = self.commit({"src/pay.py": "# @CODE:PAY-001\n"})
+        _, cache = self.check(head, base)
+        with mock.patch.object(pre_push, "changed_blobs") as changed_blobs:
+            notes, _ = self.check(head, base, cache)
+        changed_blobs.assert_not_called()
+        self.assertEqual(len(notes), 1)
+
+    def test_cache_round_trip_and_older_versions(self) -> None:
+        path = self.root / "pre-push.json"
+        path.write_text(json.dumps({"abc": {"warnings": [], "tags": []}}), encoding="utf-8")
+        self.assertEqual(pre_push.load_cache(path), {"commits": {}, "blobs": {}})
+        cache = {"commits": {f"c{n}": [] for n in range(5)}, "blobs": {"b:src/a.py": {"warnings": [], "tags": []}}}
+        with mock.patch.object(pre_push, "MAX_CACHE_ENTRIES", 3):
+            pre_push.save_cache(path, cache)
+        loaded = pre_push.load_cache(path)
+        self.assertEqual(list(loaded["commits"]), ["c2", "c3", "c4"])
+        self.assertEqual(loaded["blobs"], cache["blobs"])
+
+
+class RunHookTest(RepoTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        cwd = Path.cwd()
+        os.chdir(self.root)
+        self.addCleanup(os.chdir, cwd)
+
+    def run_hook(self, stdin: str, env: dict[str, str] | None = None) -> tuple[int, str]:
+        err = io.StringIO()
+        with mock.patch.object(sys, "stdin", io.StringIO(stdin)), mock.patch.dict(os.environ, env or {}), \
+                contextlib.redirect_stderr(err):
+            code = pre_push.main(["origin", "git@example.com:shop.git"])
+        return code, err.getvalue()
+
+    def test_stdin_ref_lines_are_checked_and_malformed_lines_ignored(self) -> None:
+        head = self.commit({"src/pay.py": "# @CODE:PAY-001\n"})
+        stdin = f"garbage\n\nrefs/heads/feature/SPEC-PAY-001 {head} refs/heads/feature/SPEC-PAY-001 {ZERO}\n"
+        code, err = self.run_hook(stdin)
+        self.assertEqual(code, 0)
+        self.assertIn("@CODE:PAY-001 has no SPEC-PAY-001", err)
+        self.assertIn("✓ Push will proceed", err)
+        self.assertTrue((self.root / ".moai/cache/pre-push.json").is_file())
+
+    def test_clean_push_prints_nothing(self) -> None:
+        head = self.commit({"src/auth.py": "# @CODE:AUTH-001\n"})
+        self.assertEqual(self.run_hook(f"refs/heads/develop {head} refs/heads/develop {ZERO}\n"), (0, ""))
+
+    def test_exhausted_budget_is_reported(self) -> None:
+        head = self.commit({"src/pay.py": "# @CODE:PAY-001\n"})
+        code, err = self.run_hook(f"refs/heads/develop {head} refs/heads/develop {ZERO}\n",
+                                  {"MOAI_PREPUSH_BUDGET": "0"})
+        self.assertEqual(code, 0)
+        self.assertIn("stopped at the 0s budget", err)
+
+    def test_unexpected_errors_never_block_the_push(self) -> None:
+        code, err = self.run_hook("", {"MOAI_PREPUSH_BUDGET": "not-a-number"})
+        self.assertEqual(code, 0)
+        self.assertIn("pre-push checks skipped: ValueError", err)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""Behaviour tests for spec_graph.py.
+
+Run with: python3 -m unittest discover -s .moai/scripts/tests
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from spec_graph import CycleError, SpecGraph, SpecNode, load_graph  # noqa: E402
+
+
+def node(spec_id: str, **fields: list[str]) -> SpecNode:
+    return SpecNode(spec_id, f".moai/specs/SPEC-{spec_id}/spec.md", **fields)
+
+
+class CyclesTest(unittest.TestCase):
+    def test_acyclic_graph_has_no_cycles(self) -> None:
+        graph = SpecGraph([node("A-001"), node("B-001", depends_on=["A-001"]), node("C-001", blocks=["B-001"])])
+        self.assertEqual(graph.cycles(), [])
+
+    def test_cycles_through_depends_on_and_blocks(self) -> None:
+        graph = SpecGraph([
+            node("A-001", depends_on=["C-001"]), node("B-001", depends_on=["A-001"]), node("C-001", depends_on=["B-001"]),
+            node("D-001", blocks=["E-001"]), node("E-001", blocks=["D-001"]),
+            node("F-001", depends_on=["A-001"]),
+        ])
+        self.assertEqual(graph.cycles(), [["A-001", "B-001", "C-001"], ["D-001", "E-001"]])
+
+    def test_self_loop_is_a_cycle(self) -> None:
+        graph = SpecGraph([node("A-001", depends_on=["A-001"]), node("B-001")])
+        self.assertEqual(graph.cycles(), [["A-001"]])
+
+    def test_related_specs_never_form_cycles(self) -> None:
+        graph = SpecGraph([node("A-001", related_specs=["B-001"]), node("B-001", related_specs=["A-001"])])
+        self.assertEqual(graph.cycles(), [])
+
+    def test_long_chains_do_not_hit_the_recursion_limit(self) -> None:
+        size = sys.getrecursionlimit() * 2
+        nodes = [node(f"A-{n:03d}", depends_on=[f"A-{n - 1:03d}"] if n else []) for n in range(size)]
+        nodes[0].depends_on.append(f"A-{size - 1:03d}")
+        cycles = SpecGraph(nodes).cycles()
+        self.assertEqual(len(cycles), 1)
+        self.assertEqual(len(cycles[0]), size)
+
+
+class TopologicalOrderTest(unittest.TestCase):
+    def test_dependencies_come_first_and_ties_break_by_id(self) -> None:
+        graph = SpecGraph([
+            node("C-001", depends_on=["B-001"]), node("B-001"), node("A-001", blocks=["C-001"]), node("D-001"),
+        ])
+        self.assertEqual(graph.topological_order(), ["A-001", "B-001", "C-001", "D-001"])
+
+    def test_unknown_references_are_ordered_too(self) -> None:
+        graph = SpecGraph([node("B-001", depends_on=["A-001"])])
+        self.assertEqual(graph.topological_order(), ["A-001", "B-001"])
+        self.assertEqual(graph.dangling(), {"B-001": ["A-001"]})
+
+    def test_cycles_raise(self) -> None:
+        graph = SpecGraph([node("A-001", depends_on=["B-001"]), node("B-001", depends_on=["A-001"]), node("C-001")])
+        with self.assertRaises(CycleError) as raised:
+            graph.topological_order()
+        self.assertEqual(raised.exception.cycles, [["A-001", "B-001"]])
+
+
+class ImpactTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.graph = SpecGraph([
+            node("AUTH-001", packages=["src/main/java/com/shop/auth"]),
+            node("PAY-001", packages=["src/main/java/com/shop/pay"], depends_on=["AUTH-001"]),
+            node("CART-001", files=["CartService.java"]),
+            node("DOCS-001", packages=["docs"]),
+        ])
+
+    def test_file_under_a_package_matches(self) -> None:
+        self.assertEqual(self.graph.specs_for_paths(["src/main/java/com/shop/auth/Login.java"]), {"AUTH-001"})
+
+    def test_scope_files_match_by_name(self) -> None:
+        self.assertEqual(self.graph.specs_for_paths(["src/main/java/com/shop/cart/CartService.java"]), {"CART-001"})
+
+    def test_directory_query_matches_packages_under_it(self) -> None:
+        self.assertEqual(self.graph.specs_for_paths(["src/main/java/com/shop"]), {"AUTH-001", "PAY-001"})
+        self.assertEqual(self.graph.specs_for_paths(["src"]), {"AUTH-001", "PAY-001"})
+
+    def test_directory_query_does_not_match_sibling_prefixes(self) -> None:
+        self.assertEqual(self.graph.specs_for_paths(["src/main/java/com/shop/au"]), set())
+
+    def test_spec_directory_query_matches_its_specs(self) -> None:
+        self.assertEqual(self.graph.specs_for_paths([".moai/specs/SPEC-PAY-001"]), {"PAY-001"})
+        self.assertEqual(len(self.graph.specs_for_paths([".moai/specs"])), 4)
+
+    def test_root_query_matches_every_spec(self) -> None:
+        self.assertEqual(self.graph.specs_for_paths(["."]), set(self.graph.nodes))
+
+    def test_impact_follows_downstream_specs(self) -> None:
+        self.assertEqual(self.graph.impact(["src/main/java/com/shop/auth/Login.java"]), {"AUTH-001", "PAY-001"})
+
+
+class LoadGraphTest(unittest.TestCase):
+    def test_edited_spec_is_parsed_again(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            spec = root / ".moai/specs/SPEC-PAY-001/spec.md"
+            spec.parent.mkdir(parents=True)
+            spec.write_text("---\nid: PAY-001\ndepends_on: [AUTH-001]\n---\n", encoding="utf-8")
+            self.assertEqual(load_graph(root).nodes["PAY-001"].depends_on, ["AUTH-001"])
+            self.assertTrue((root / ".moai/cache/spec-graph.json").is_file())
+            spec.write_text("---\nid: PAY-001\ndepends_on:\n- AUTH-001\n- CART-001\n---\n", encoding="utf-8")
+            self.assertEqual(load_graph(root).nodes["PAY-001"].depends_on, ["AUTH-001", "CART-001"])
+
+
+if __name__ == "__main__":
+    unittest.main()
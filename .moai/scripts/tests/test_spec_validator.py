@@ -0,0 +1,109 @@
+"""Behaviour tests for spec_validator.py, run against throwaway projects.
+
+Run with: python3 -m unittest discover -s .moai/scripts/tests
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import spec_validator  # noqa: E402
+from moai_core import read_spec_header  # noqa: E402
+
+SPEC = """---
+id: {id}
+version: 0.1.0
+status: active
+created: 2025-10-01
+updated: 2025-10-02
+author: @tester
+priority: medium
+---
+
+# @SPEC:{id}
+
+## HISTORY
+
+### v0.1.0 (2025-10-02)
+- implemented
+"""
+
+
+def check(text: str, spec_dir: str | None = None) -> tuple[list[str], list[str]]:
+    return spec_validator.check_spec(read_spec_header(text.splitlines(keepends=True)), spec_dir)
+
+
+class CheckSpecTest(unittest.TestCase):
+    def test_valid_spec_passes(self) -> None:
+        self.assertEqual(check(SPEC.format(id="AUTH-001"), "SPEC-AUTH-001"), ([], []))
+
+    def test_field_errors(self) -> None:
+        text = SPEC.format(id="AUTH-001").replace("@tester", "tester").replace("2025-10-02\n", "2025-09-01\n", 1)
+        errors, _ = check(text, "SPEC-AUTH-002")
+        self.assertEqual(errors, ["directory `SPEC-AUTH-002` does not match id (expected SPEC-AUTH-001)",
+                                  "author `tester` must be a single @GitHubHandle",
+                                  "updated is earlier than created"])
+
+    def test_missing_front_matter_and_history(self) -> None:
+        self.assertEqual(check("# @SPEC:AUTH-001\n"), (["missing YAML front matter"], []))
+        self.assertEqual(check(SPEC.format(id="AUTH-001").split("## HISTORY")[0])[0], ["missing ## HISTORY section"])
+
+    def test_history_version_mismatch_is_a_warning(self) -> None:
+        _, warnings = check(SPEC.format(id="AUTH-001").replace("version: 0.1.0", "version: 0.2.0"))
+        self.assertEqual(warnings, ["latest HISTORY entry v0.1.0 differs from version 0.2.0"])
+
+
+class ChangedSinceTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        for spec_id in ("AUTH-001", "PAY-001"):
+            self.write(f".moai/specs/SPEC-{spec_id}/spec.md", SPEC.format(id=spec_id))
+        self.write(".moai/config.json", "{}")
+        self.git("init", "-q")
+        self.git("add", "-A")
+        self.git("commit", "-q", "-m", "base")
+        cwd = Path.cwd()
+        os.chdir(self.root)
+        self.addCleanup(os.chdir, cwd)
+
+    def write(self, rel: str, content: str) -> None:
+        path = self.root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+
+    def git(self, *args: str) -> None:
+        subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+                       cwd=self.root, capture_output=True, check=True)
+
+    def test_only_changed_specs_are_validated(self) -> None:
+        self.write(".moai/specs/SPEC-PAY-001/spec.md", SPEC.format(id="PAY-001").replace("@tester", "tester"))
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(io.StringIO()):
+            code = spec_validator.main(["--changed-since", "HEAD"])
+        self.assertEqual(code, 1)
+        results = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([(r["id"], r["ok"]) for r in results], [("PAY-001", False)])
+
+    def test_unknown_ref_is_a_usage_error(self) -> None:
+        err = io.StringIO()
+        with contextlib.redirect_stderr(err), self.assertRaises(SystemExit) as exit_:
+            spec_validator.main(["--changed-since", "nope-ref"])
+        self.assertEqual(exit_.exception.code, 2)
+        self.assertIn("cannot diff against --changed-since 'nope-ref'", err.getvalue())
+        self.assertNotIn("Traceback", err.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""Behaviour tests for sync_daemon.py, run against throwaway projects.
+
+Run with: python3 -m unittest discover -s .moai/scripts/tests
+"""
+
+from __future__ import annotations
+
+import contextlib
+import errno
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import sync_daemon  # noqa: E402
+from fs_watch import PollingWatcher  # noqa: E402
+from sync_daemon import SyncState  # noqa: E402
+
+
+class FailingWatcher:
+    """Stands in for an inotify watcher that runs out of watches."""
+
+    def __init__(self) -> None:
+        self.closed = False
+
+    def poll(self, timeout: float | None) -> set[str]:
+        raise OSError(errno.ENOSPC, "inotify_add_watch failed for src/new")
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class StoppingPollingWatcher(PollingWatcher):
+    """Polls once, then fails, so that `_watch_loop` gives up and returns."""
+
+    def __init__(self, root: Path, roots: tuple[str, ...]) -> None:
+        super().__init__(root, roots, interval=0)
+        self.polls = 0
+
+    def poll(self, timeout: float | None) -> set[str]:
+        self.polls += 1
+        if self.polls > 1:
+            raise PermissionError(errno.EACCES, "src is not readable")
+        return super().poll(timeout)
+
+
+class SyncStateTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.write("src/auth.py", "# @CODE:AUTH-001\n")
+        self.state = SyncState(self.root)
+        self.addCleanup(self.state.index.close)
+        self.state.watcher = "InotifyWatcher"
+
+    def write(self, rel: str, content: str) -> None:
+        path = self.root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+
+    def test_applied_batch_updates_answers_and_report(self) -> None:
+        self.write("tests/test_auth.py", "# @TEST:AUTH-001\n")
+        self.state.apply({str(self.root / "tests/test_auth.py")})
+        response = self.state.handle({"cmd": "where", "tag": "TEST:AUTH-001"})
+        self.assertEqual([loc["path"] for loc in response["locations"]], ["tests/test_auth.py"])
+        report = (self.root / ".moai/reports/tag-status.md").read_text(encoding="utf-8")
+        self.assertIn("- AUTH-001: missing @SPEC", report)
+        self.assertFalse((self.root / ".moai/reports/sync-report.md").exists())
+
+    def test_failed_watcher_falls_back_to_polling_and_rescans(self) -> None:
+        failing = FailingWatcher()
+        self.write("src/new/pay.py", "# @CODE:PAY-001\n")
+        with mock.patch.object(sync_daemon, "PollingWatcher", StoppingPollingWatcher), \
+                contextlib.redirect_stderr(io.StringIO()) as err:
+            sync_daemon._watch_loop(failing, self.state, debounce=0)
+        self.assertTrue(failing.closed)
+        self.assertIn("FailingWatcher", err.getvalue())
+        self.assertEqual(self.state.batches, 2)
+        self.assertEqual(self.state.last_batch["parsed"], 1)
+
+        status = self.state.handle({"cmd": "status"})
+        self.assertEqual(status["watcher"], "stopped")
+        self.assertIn(f"FailingWatcher: [Errno {errno.ENOSPC}]", status["watcher_error"])
+        self.assertIn("StoppingPollingWatcher", status["watcher_error"])
+
+    def test_stopped_watcher_declines_tag_queries(self) -> None:
+        self.state.watcher = ""
+        self.state.watcher_error = "InotifyWatcher: no space left"
+        for request in ({"cmd": "broken"}, {"cmd": "where", "tag": "AUTH-001"}):
+            with self.subTest(request=request):
+                response = self.state.handle(request)
+                self.assertFalse(response["ok"])
+                self.assertIn("may be stale", response["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
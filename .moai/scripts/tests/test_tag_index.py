@@ -0,0 +1,172 @@
+"""Behaviour tests for tag_index.py, run against throwaway projects.
+
+Run with: python3 -m unittest discover -s .moai/scripts/tests
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import tag_index  # noqa: E402
+from tag_index import BrokenChain, TagIndex, TagLocation  # noqa: E402
+
+PROJECT = {
+    ".moai/config.json": "{}",
+    ".moai/specs/SPEC-AUTH-001/spec.md": "# @SPEC:AUTH-001: Auth\n",
+    "tests/test_auth.py": "# @TEST:AUTH-001\n",
+    "src/auth.py": "# @CODE:AUTH-001:API\n# SPEC: SPEC-AUTH-001.md v0.1.0\n",
+}
+
+
+class TagIndexTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        for rel, content in PROJECT.items():
+            self.write(rel, content)
+
+    def write(self, rel: str, content: str) -> None:
+        path = self.root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+
+    def open_index(self) -> TagIndex:
+        index = TagIndex(self.root)
+        self.addCleanup(index.close)
+        return index
+
+
+class RefreshTest(TagIndexTestCase):
+    def test_first_refresh_indexes_tags_and_version_refs(self) -> None:
+        index = self.open_index()
+        stats = index.refresh()
+        self.assertEqual((stats.scanned, stats.parsed, stats.removed), (3, 3, 0))
+        self.assertEqual(index.where("AUTH-001", "CODE"), [TagLocation("CODE", "AUTH-001", "src/auth.py", 1, "API")])
+        self.assertEqual([(ref.spec_id, ref.version) for ref in index.version_refs()], [("AUTH-001", "0.1.0")])
+        self.assertEqual(index.broken_chains(), [])
+
+    def test_unchanged_files_are_not_parsed_again(self) -> None:
+        index = self.open_index()
+        index.refresh()
+        self.assertEqual(index.refresh().parsed, 0)
+
+    def test_touched_file_with_same_content_keeps_its_tags(self) -> None:
+        index = self.open_index()
+        index.refresh()
+        path = self.root / "src/auth.py"
+        os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+        self.assertEqual(index.refresh().parsed, 0)
+        self.assertEqual(len(index.where("AUTH-001", "CODE")), 1)
+
+    def test_edited_file_replaces_its_tags(self) -> None:
+        index = self.open_index()
+        index.refresh()
+        self.write("src/auth.py", "# @CODE:PAY-001\n")
+        self.assertEqual(index.refresh().parsed, 1)
+        self.assertEqual(index.where("AUTH-001", "CODE"), [])
+        self.assertEqual(index.broken_chains(), [BrokenChain("AUTH-001", ("SPEC", "TEST"), ("CODE",)),
+                                                 BrokenChain("PAY-001", ("CODE",), ("SPEC", "TEST"))])
+
+    def test_deleted_file_is_forgotten(self) -> None:
+        index = self.open_index()
+        index.refresh()
+        (self.root / "tests/test_auth.py").unlink()
+        self.assertEqual(index.refresh().removed, 1)
+        self.assertEqual(index.where("AUTH-001", "TEST"), [])
+        self.assertEqual(index.tags_in("tests/test_auth.py"), [])
+
+    def test_refreshing_named_paths_handles_deletions(self) -> None:
+        index = self.open_index()
+        index.refresh()
+        (self.root / "src/auth.py").unlink()
+        stats = index.refresh([Path("src/auth.py")])
+        self.assertEqual((stats.scanned, stats.removed), (1, 1))
+        self.assertEqual(index.version_refs(), [])
+
+    def test_binary_files_yield_no_tags(self) -> None:
+        (self.root / "src/blob.bin").write_bytes(b"\0@CODE:BIN-001\n")
+        index = self.open_index()
+        index.refresh()
+        self.assertEqual(index.where("BIN-001"), [])
+
+    def test_duplicate_spec_ids_are_reported(self) -> None:
+        self.write(".moai/specs/SPEC-AUTH-002/spec.md", "# @SPEC:AUTH-001: copy\n")
+        index = self.open_index()
+        index.refresh()
+        self.assertEqual(index.duplicate_specs(), {"AUTH-001": [".moai/specs/SPEC-AUTH-001/spec.md",
+                                                                ".moai/specs/SPEC-AUTH-002/spec.md"]})
+
+
+class SchemaTest(TagIndexTestCase):
+    def test_index_from_an_older_schema_is_rebuilt(self) -> None:
+        db_path = self.root / ".moai/cache/tag-index.sqlite3"
+        db_path.parent.mkdir(parents=True)
+        with contextlib.closing(sqlite3.connect(db_path)) as conn, conn:
+            conn.executescript(
+                "CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);"
+                "INSERT INTO meta VALUES ('schema', '1');"
+                "CREATE TABLE files (path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER);"
+                "CREATE TABLE tags (path TEXT, line INTEGER, kind TEXT, tag_id TEXT);"
+                "INSERT INTO tags VALUES ('gone.py', 1, 'CODE', 'OLD-001');"
+            )
+        index = self.open_index()
+        self.assertTrue(index.is_empty())
+        self.assertEqual(index.where("OLD-001"), [])
+        self.assertEqual(index.refresh().parsed, 3)
+        schema = index.conn.execute("SELECT value FROM meta WHERE key = 'schema'").fetchone()[0]
+        self.assertEqual(schema, str(tag_index.SCHEMA_VERSION))
+
+    def test_current_schema_is_kept(self) -> None:
+        self.open_index().refresh()
+        self.assertFalse(self.open_index().is_empty())
+
+
+class MainTest(TagIndexTestCase):
+    """No daemon runs in the throwaway project, so `main` falls back to the index."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        cwd = Path.cwd()
+        os.chdir(self.root)
+        self.addCleanup(os.chdir, cwd)
+
+    def run_main(self, *args: str) -> tuple[int, str]:
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            code = tag_index.main(list(args))
+        return code, out.getvalue()
+
+    def test_where_sees_files_added_since_the_last_query(self) -> None:
+        self.run_main("broken")
+        self.write("tests/test_new.py", "# @TEST:ZZZ-001\n")
+        self.assertEqual(self.run_main("where", "@TEST:ZZZ-001"), (0, "tests/test_new.py:1: @TEST:ZZZ-001\n"))
+        self.assertEqual(self.run_main("broken"), (1, "ZZZ-001: missing @SPEC, @CODE\n"))
+
+    def test_broken_forgets_deleted_files(self) -> None:
+        self.write("tests/test_new.py", "# @TEST:ZZZ-001\n")
+        self.assertEqual(self.run_main("broken")[0], 1)
+        (self.root / "tests/test_new.py").unlink()
+        self.assertEqual(self.run_main("broken"), (0, ""))
+
+    def test_no_refresh_answers_from_the_last_refresh(self) -> None:
+        self.run_main("refresh")
+        self.write("tests/test_new.py", "# @TEST:ZZZ-001\n")
+        self.assertEqual(self.run_main("--no-refresh", "where", "ZZZ-001"), (0, ""))
+
+    def test_no_refresh_still_builds_a_missing_index(self) -> None:
+        self.assertEqual(self.run_main("--no-refresh", "where", "CODE:AUTH-001"),
+                         (0, "src/auth.py:1: @CODE:AUTH-001:API\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,206 @@
+"""Behaviour tests for test_selector.py, run against throwaway projects.
+
+Run with: python3 -m unittest discover -s .moai/scripts/tests
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import test_selector  # noqa: E402
+
+SPEC = """---
+id: {id}
+version: 0.0.1
+status: active
+created: 2025-10-01
+updated: 2025-10-01
+author: @tester
+priority: medium
+scope:
+  packages:
+    - {package}
+---
+
+# @SPEC:{id}: {id}
+"""
+
+PROJECT = {
+    ".moai/config.json": "{}",
+    ".moai/specs/SPEC-AUTH-001/spec.md": SPEC.format(id="AUTH-001", package="src/auth"),
+    ".moai/specs/SPEC-PAY-001/spec.md": SPEC.format(id="PAY-001", package="src/pay"),
+    "src/auth/service.py": "# @CODE:AUTH-001\n",
+    "src/auth/util.py": "def helper():\n    return 1\n",
+    "src/pay/gateway.py": "# @CODE:PAY-001\n",
+    "src/misc/untagged.py": "x = 1\n",
+    "tests/test_auth.py": "# @TEST:AUTH-001\n",
+    "tests/test_other.py": "# @TEST:OTHER-001\n",
+    "tests/helpers.py": "def make_user():\n    return {}\n",
+    "tests/__init__.py": "",
+    "tests/fixtures/data.json": "{}\n",
+    "tests/conftest.py": "",
+    "src/test/java/com/shop/auth/AuthServiceTest.java": "package com.shop.auth;\n// @TEST:AUTH-001\n",
+    "src/test/java/com/shop/auth/Fixtures.java": "package com.shop.auth;\n",
+    "build.gradle": "",
+    "app/src/main/java/com/shop/Foo.java": "package com.shop;\n",
+    "mypkg/core.py": "x = 1\n",
+    "lib/util.kt": "fun util() = 1\n",
+    "docs/guide.txt": "guide\n",
+    ".moai/memory/development-guide.md": "# Guide\n",
+    ".moai/specs/SPEC-AUTH-001/plan.txt": "plan\n",
+    "README.md": "# Shop\n",
+}
+
+
+class SelectorTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        for rel, content in PROJECT.items():
+            path = self.root / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding="utf-8")
+
+    def select(self, *changed: str) -> test_selector.Selection:
+        return test_selector.select(self.root, list(changed))
+
+
+class SelectTest(SelectorTestCase):
+    def test_changed_test_file_is_selected_alone(self) -> None:
+        selection = self.select("tests/test_other.py")
+        self.assertFalse(selection.full)
+        self.assertEqual(selection.tests, ["tests/test_other.py"])
+
+    def test_tagged_code_selects_its_tests(self) -> None:
+        selection = self.select("src/auth/service.py")
+        self.assertFalse(selection.full)
+        self.assertEqual(selection.tests, ["src/test/java/com/shop/auth/AuthServiceTest.java", "tests/test_auth.py"])
+
+    def test_untagged_file_in_spec_scope_selects_the_spec_tests(self) -> None:
+        self.assertEqual(self.select("src/auth/util.py").tests[-1], "tests/test_auth.py")
+
+    def test_helper_and_fixture_changes_force_a_full_run(self) -> None:
+        for changed in ("tests/helpers.py", "tests/fixtures/data.json", "tests/__init__.py",
+                        "src/test/java/com/shop/auth/Fixtures.java"):
+            with self.subTest(changed=changed):
+                selection = self.select(changed)
+                self.assertTrue(selection.full)
+                self.assertEqual(selection.tests, [])
+                self.assertIn(changed, selection.reason)
+
+    def test_support_change_wins_over_test_changes_in_the_same_diff(self) -> None:
+        self.assertTrue(self.select("tests/test_auth.py", "tests/helpers.py").full)
+
+    def test_build_and_conftest_changes_force_a_full_run(self) -> None:
+        for changed in ("build.gradle", "tests/conftest.py"):
+            with self.subTest(changed=changed):
+                self.assertTrue(self.select(changed).full)
+
+    def test_untagged_source_outside_any_scope_forces_a_full_run(self) -> None:
+        self.assertTrue(self.select("src/misc/untagged.py").full)
+
+    def test_untagged_code_outside_src_and_tests_forces_a_full_run(self) -> None:
+        for changed in ("app/src/main/java/com/shop/Foo.java", "mypkg/core.py", "lib/util.kt", "Makefile"):
+            with self.subTest(changed=changed):
+                selection = self.select(changed)
+                self.assertTrue(selection.full)
+                self.assertIn(changed, selection.reason)
+
+    def test_spec_documents_select_the_spec_tests(self) -> None:
+        selection = self.select(".moai/specs/SPEC-AUTH-001/plan.txt")
+        self.assertFalse(selection.full)
+        self.assertEqual(selection.tests[-1], "tests/test_auth.py")
+
+    def test_deleted_untagged_file_forces_a_full_run(self) -> None:
+        self.assertTrue(self.select("mypkg/removed.py").full)
+
+    def test_documentation_changes_select_nothing(self) -> None:
+        for changed in ("docs/guide.txt", ".moai/memory/development-guide.md", "src/misc/NOTES.md"):
+            with self.subTest(changed=changed):
+                selection = self.select(changed)
+                self.assertFalse(selection.full)
+                self.assertEqual(selection.tests, [])
+
+    def test_code_without_test_forces_a_full_run(self) -> None:
+        selection = self.select("src/pay/gateway.py")
+        self.assertTrue(selection.full)
+        self.assertIn("@CODE:PAY-001", selection.reason)
+
+    def test_docs_only_change_selects_nothing(self) -> None:
+        selection = self.select("README.md")
+        self.assertFalse(selection.full)
+        self.assertEqual(selection.tests, [])
+
+
+class TargetsTest(SelectorTestCase):
+    def test_pytest_targets_keep_python_files(self) -> None:
+        tests = ["src/test/java/com/shop/auth/AuthServiceTest.java", "tests/test_auth.py"]
+        self.assertEqual(test_selector.pytest_targets(self.root, tests), ["tests/test_auth.py"])
+
+    def test_gradle_targets_use_fully_qualified_names(self) -> None:
+        tests = ["src/test/java/com/shop/auth/AuthServiceTest.java", "tests/test_auth.py"]
+        self.assertEqual(test_selector.gradle_targets(self.root, tests), ["--tests", "com.shop.auth.AuthServiceTest"])
+
+
+class MainTest(SelectorTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.git("init", "-q")
+        self.git("add", "-A")
+        self.git("commit", "-q", "-m", "base")
+        self.base = self.git("rev-parse", "HEAD").strip()
+        cwd = Path.cwd()
+        os.chdir(self.root)
+        self.addCleanup(os.chdir, cwd)
+
+    def git(self, *args: str) -> str:
+        return subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+                              cwd=self.root, capture_output=True, text=True, check=True).stdout
+
+    def commit(self, rel: str) -> None:
+        with open(self.root / rel, "a", encoding="utf-8") as handle:
+            handle.write("# changed\n")
+        self.git("commit", "-q", "-am", f"change {rel}")
+
+    def run_main(self, *args: str) -> tuple[int, str]:
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(io.StringIO()):
+            code = test_selector.main(["--base", self.base, *args])
+        return code, out.getvalue()
+
+    def test_helper_only_commit_exits_for_a_full_run(self) -> None:
+        self.commit("tests/helpers.py")
+        code, out = self.run_main("--format", "pytest")
+        self.assertEqual(code, test_selector.EXIT_FULL_RUN)
+        self.assertEqual(out, "")
+
+    def test_json_output_reports_the_full_run(self) -> None:
+        self.commit("tests/fixtures/data.json")
+        code, out = self.run_main("--format", "json")
+        self.assertEqual(code, test_selector.EXIT_FULL_RUN)
+        result = json.loads(out)
+        self.assertTrue(result["full"])
+        self.assertEqual(result["tests"], [])
+
+    def test_tagged_change_prints_pytest_targets(self) -> None:
+        self.commit("src/auth/service.py")
+        self.assertEqual(self.run_main("--format", "pytest"), (0, "tests/test_auth.py\n"))
+
+    def test_unusable_base_forces_a_full_run(self) -> None:
+        self.base = "0" * 40
+        self.assertEqual(self.run_main("--format", "gradle")[0], test_selector.EXIT_FULL_RUN)
+
+
+if __name__ == "__main__":
+    unittest.main()